@@ -11,10 +11,12 @@ __author__ = "William Smith"
 from .chatbot import ChatBot
 from .movie_booking import MovieBookingChatBot
 from .models import Intent, Movie, ShowTime, Booking
+from .worker_pool import WorkerPool
 
 __all__ = [
     'ChatBot',
     'MovieBookingChatBot', 
+    'WorkerPool',
     'Intent',
     'Movie',
     'ShowTime',
@@ -0,0 +1,167 @@
+"""
+Cold storage for past showtimes and settled bookings.
+
+Compaction moves showtimes older than a retention window, their bookings and
+cancelled bookings out of the chatbot's in-memory dictionaries into a SQLite
+file. Each record is stored as zlib-compressed JSON, indexed by ID and by
+user name so booking status lookups can still read them transparently.
+The archive also issues booking numbers, so every chatbot and process that
+shares an archive file gets distinct booking IDs.
+"""
+
+import json
+import sqlite3
+import threading
+import zlib
+from dataclasses import asdict
+from datetime import datetime, timedelta
+from typing import Iterable, List, Optional
+from .models import Booking, ShowTime
+
+
+def _compress(record: dict) -> bytes:
+    return zlib.compress(json.dumps(record, default=datetime.isoformat).encode('utf-8'))
+
+
+def _decompress(blob: bytes) -> dict:
+    return json.loads(zlib.decompress(blob).decode('utf-8'))
+
+
+class BookingArchive:
+    """Compressed on-disk archive of showtimes and bookings"""
+
+    def __init__(self, path: str = "booking_archive.db"):
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        with self._db:
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS showtimes (id TEXT PRIMARY KEY, data BLOB NOT NULL)"
+            )
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS bookings ("
+                "id TEXT PRIMARY KEY, user_name TEXT NOT NULL, data BLOB NOT NULL)"
+            )
+            self._db.execute(
+                "CREATE INDEX IF NOT EXISTS bookings_by_user ON bookings (user_name)"
+            )
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS booking_numbers ("
+                "number INTEGER PRIMARY KEY AUTOINCREMENT)"
+            )
+        # Archives created before booking numbers were issued here start
+        # counting after their highest archived booking
+        self._db.execute("BEGIN IMMEDIATE")
+        try:
+            seeded = self._db.execute(
+                "SELECT 1 FROM sqlite_sequence WHERE name = 'booking_numbers'"
+            ).fetchone()
+            if seeded is None:
+                self._db.execute(
+                    "INSERT INTO sqlite_sequence (name, seq) VALUES ('booking_numbers', ?)",
+                    (self.last_booking_number(),)
+                )
+            self._db.commit()
+        except BaseException:
+            self._db.rollback()
+            raise
+
+    def archive(self, showtimes: Iterable[ShowTime], bookings: Iterable[Booking],
+                replace: bool = False) -> None:
+        """Write showtimes and bookings in one transaction.
+
+        Showtimes are catalog data, so archiving one again just refreshes it.
+        Bookings are only replaced when ``replace`` is true; otherwise, if any
+        booking ID is already archived this raises sqlite3.IntegrityError and
+        writes nothing.
+        """
+        insert = "INSERT OR REPLACE" if replace else "INSERT"
+        with self._lock, self._db:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO showtimes (id, data) VALUES (?, ?)",
+                ((st.id, _compress(asdict(st))) for st in showtimes)
+            )
+            self._db.executemany(
+                f"{insert} INTO bookings (id, user_name, data) VALUES (?, ?, ?)",
+                ((b.id, b.user_name, _compress(asdict(b))) for b in bookings)
+            )
+
+    def get_showtime(self, showtime_id: str) -> Optional[ShowTime]:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT data FROM showtimes WHERE id = ?", (showtime_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        data = _decompress(row[0])
+        data['datetime'] = datetime.fromisoformat(data['datetime'])
+        return ShowTime(**data)
+
+    def get_booking(self, booking_id: str) -> Optional[Booking]:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT data FROM bookings WHERE id = ?", (booking_id,)
+            ).fetchone()
+        return self._booking(row[0]) if row else None
+
+    def bookings_for_user(self, user_name: str) -> List[Booking]:
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT data FROM bookings WHERE user_name = ? ORDER BY rowid", (user_name,)
+            ).fetchall()
+        return [self._booking(row[0]) for row in rows]
+
+    def last_booking_number(self) -> int:
+        """Highest archived BK number"""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT MAX(CAST(SUBSTR(id, 3) AS INTEGER)) FROM bookings WHERE id LIKE 'BK%'"
+            ).fetchone()
+        return row[0] or 0
+
+    def next_booking_id(self) -> str:
+        """Issue a booking ID that is unique among all users of this archive file"""
+        with self._lock, self._db:
+            number = self._db.execute("INSERT INTO booking_numbers DEFAULT VALUES").lastrowid
+            # AUTOINCREMENT never reuses numbers, so only the newest row is needed
+            self._db.execute("DELETE FROM booking_numbers WHERE number < ?", (number,))
+        return f"BK{number}"
+
+    @staticmethod
+    def _booking(blob: bytes) -> Booking:
+        data = _decompress(blob)
+        data['timestamp'] = datetime.fromisoformat(data['timestamp'])
+        return Booking(**data)
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+
+class CompactionTask:
+    """Background thread that periodically compacts a chatbot's (or WorkerPool's) hot data"""
+
+    def __init__(self, bot, interval: float = 3600.0,
+                 retention: timedelta = timedelta(days=1)):
+        self.bot = bot
+        self.interval = interval
+        self.retention = retention
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.bot.compact(self.retention)
+            except Exception as e:
+                print(f"Error compacting bookings: {e}")
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
@@ -0,0 +1,362 @@
+"""
+Binary catalog file shared read-only between worker processes.
+
+The parent process (or the catalog_import tool) writes movies, showtimes and
+the compiled intent pattern tokens into a single columnar file. Readers
+memory-map it and decode records lazily, so opening a catalog takes the same
+time whatever its size and every process shares one page-cache copy.
+
+Layout (all numbers in the writer's native byte order, sections 8-byte aligned):
+    header       magic, version, byte order, section offsets and counts
+    strings      uint32 offsets (count + 1) immediately followed by a UTF-8 blob
+    movies       columns id, title, duration, language, genre sorted by id
+    showtimes    columns id, movie_id, datetime, price, seat layout,
+                 seat bitmap offset sorted by id, then a row index sorted
+                 by movie and time
+    seats        packed availability bitmaps, one bit per seat in the layout
+    intents      JSON object mapping pattern -> preprocessed tokens
+"""
+
+import json
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from array import array
+from collections.abc import Mapping
+from types import MappingProxyType
+from datetime import datetime, timedelta
+from typing import Collection, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+from .models import Movie, ShowTime
+
+MAGIC = b"MBCATLG\0"
+VERSION = 2
+_EPOCH = datetime(1970, 1, 1)
+
+# magic, version, little endian flag, string count, strings offset,
+# movie count, movies offset, showtime count, showtimes offset,
+# seats offset, seats length, intents offset, intents length
+_HEADER = struct.Struct("<8sHH10Q")
+
+_SHOWTIME_COLUMNS = ('I', 'I', 'q', 'd', 'I', 'Q', 'I')
+
+# id, movie_id, datetime, price, seat layout, booked seats (None if all free)
+ShowTimeRecord = Tuple[str, str, datetime, float, Sequence[str], Optional[Collection[str]]]
+
+
+def _to_micros(value: datetime) -> int:
+    """Convert a naive datetime to microseconds since 1970-01-01"""
+    delta = value - _EPOCH
+    return (delta.days * 86400 + delta.seconds) * 1_000_000 + delta.microseconds
+
+
+def _from_micros(value: int) -> datetime:
+    return _EPOCH + timedelta(microseconds=value)
+
+
+class _StringTableBuilder:
+    """Deduplicating string table used while writing a catalog"""
+
+    def __init__(self):
+        self.index: Dict[str, int] = {}
+        self.strings: List[str] = []
+
+    def add(self, value: str) -> int:
+        if value not in self.index:
+            self.index[value] = len(self.strings)
+            self.strings.append(value)
+        return self.index[value]
+
+    def encode(self) -> bytes:
+        offsets = array('I', [0])
+        blob = bytearray()
+        for value in self.strings:
+            blob += value.encode('utf-8')
+            offsets.append(len(blob))
+        return offsets.tobytes() + bytes(blob)
+
+
+def _pad(buffer: bytearray) -> None:
+    buffer += b"\0" * (-len(buffer) % 8)
+
+
+class _SeatBitmapBuilder:
+    """Availability bitmaps, reusing the all-free bitmap of each layout"""
+
+    def __init__(self):
+        self._layouts: Dict[int, Tuple[bytes, Dict[str, int]]] = {}
+
+    def encode(self, layout_index: int, layout: Sequence[str],
+               booked: Optional[Collection[str]]) -> bytes:
+        if layout_index not in self._layouts:
+            bits = bytearray((len(layout) + 7) // 8)
+            for i in range(len(layout)):
+                bits[i >> 3] |= 1 << (i & 7)
+            positions = {seat: i for i, seat in enumerate(layout)}
+            self._layouts[layout_index] = (bytes(bits), positions)
+
+        all_free, positions = self._layouts[layout_index]
+        if not booked:
+            return all_free
+        bits = bytearray(all_free)
+        for seat in booked:
+            i = positions.get(seat)
+            if i is not None:
+                bits[i >> 3] &= ~(1 << (i & 7))
+        return bytes(bits)
+
+
+def write_catalog(path: str,
+                  movies: Mapping,
+                  showtimes: Mapping,
+                  pattern_tokens: Optional[Dict[str, List[str]]] = None) -> None:
+    """Write in-memory movies, showtimes and compiled intent tokens to a catalog file"""
+    write_records(
+        path,
+        movies.values(),
+        ((st.id, st.movie_id, st.datetime, st.price, st.available_seats, None)
+         for st in showtimes.values()),
+        pattern_tokens
+    )
+
+
+def write_records(path: str,
+                  movies: Iterable[Movie],
+                  showtimes: Iterable[ShowTimeRecord],
+                  pattern_tokens: Optional[Dict[str, List[str]]] = None) -> None:
+    """Write a catalog from streams of movies and showtime records"""
+    strings = _StringTableBuilder()
+
+    movie_cols = [array('I') for _ in range(5)]
+    for movie in sorted(movies, key=lambda m: m.id):
+        movie_cols[0].append(strings.add(movie.id))
+        movie_cols[1].append(strings.add(movie.title))
+        movie_cols[2].append(movie.duration)
+        movie_cols[3].append(strings.add(movie.language))
+        movie_cols[4].append(strings.add(movie.genre))
+
+    # Keep only compact tuples per showtime; layouts are shared through the string table
+    rows = []
+    bitmaps = bytearray()
+    seat_bitmaps = _SeatBitmapBuilder()
+    for showtime_id, movie_id, when, price, layout, booked in showtimes:
+        layout_index = strings.add(",".join(layout))
+        rows.append((showtime_id, movie_id, _to_micros(when), price, layout_index, len(bitmaps)))
+        bitmaps += seat_bitmaps.encode(layout_index, layout, booked)
+    rows.sort()
+
+    showtime_cols = [array(fmt) for fmt in _SHOWTIME_COLUMNS]
+    for showtime_id, movie_id, micros, price, layout, seat_offset in rows:
+        showtime_cols[0].append(strings.add(showtime_id))
+        showtime_cols[1].append(strings.add(movie_id))
+        showtime_cols[2].append(micros)
+        showtime_cols[3].append(price)
+        showtime_cols[4].append(layout)
+        showtime_cols[5].append(seat_offset)
+    showtime_cols[6].extend(sorted(range(len(rows)), key=lambda r: (rows[r][1], rows[r][2])))
+    del rows
+
+    body = bytearray()
+    offset = _HEADER.size + (-_HEADER.size % 8)
+
+    def section(columns) -> int:
+        start = offset + len(body)
+        for column in columns:
+            body.extend(column)
+            _pad(body)
+        return start
+
+    strings_offset = section([strings.encode()])
+    movies_offset = section(movie_cols)
+    showtimes_offset = section(showtime_cols)
+    seats_offset = section([bitmaps])
+    intents = json.dumps(pattern_tokens or {}).encode('utf-8')
+    intents_offset = section([intents])
+
+    header = _HEADER.pack(
+        MAGIC, VERSION, sys.byteorder == 'little',
+        len(strings.strings), strings_offset,
+        len(movie_cols[0]), movies_offset,
+        len(showtime_cols[0]), showtimes_offset,
+        seats_offset, len(bitmaps),
+        intents_offset, len(intents)
+    )
+    # Replace the file atomically: processes that already mapped the old
+    # catalog keep reading it, new readers see the complete new one
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(header + b"\0" * (offset - len(header)))
+            f.write(body)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+
+class _RecordView(Mapping):
+    """Read-only id -> record mapping that decodes records on access"""
+
+    def __init__(self, catalog: 'MappedCatalog', ids: memoryview, decode):
+        self._catalog = catalog
+        self._ids = ids
+        self._decode = decode
+
+    def _find(self, key: str) -> int:
+        lo, hi = 0, len(self._ids)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._catalog.string(self._ids[mid]) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < len(self._ids) and self._catalog.string(self._ids[lo]) == key:
+            return lo
+        raise KeyError(key)
+
+    def __getitem__(self, key: str):
+        return self._decode(self._find(key))
+
+    def __iter__(self) -> Iterator[str]:
+        return (self._catalog.string(i) for i in self._ids)
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+
+class MappedCatalog:
+    """Memory-mapped, read-only view of a catalog file"""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            stat = os.fstat(f.fileno())
+        # Changes whenever the file is rebuilt
+        self.version = f"{stat.st_size}-{stat.st_mtime_ns}"
+        self._buffer = memoryview(self._mmap)
+
+        (magic, version, little_endian, string_count, strings_offset,
+         movie_count, movies_offset, showtime_count, showtimes_offset,
+         seats_offset, seats_length, intents_offset, intents_length) = _HEADER.unpack_from(self._buffer)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} catalog file")
+        if bool(little_endian) != (sys.byteorder == 'little'):
+            raise ValueError(f"{path} was written with a different byte order")
+
+        self._string_offsets, _ = self._column(strings_offset, 'I', string_count + 1)
+        # The UTF-8 blob follows the offsets directly, without alignment padding
+        blob_offset = strings_offset + self._string_offsets.nbytes
+        self._string_blob = self._buffer[blob_offset:blob_offset + self._string_offsets[-1]]
+
+        cols, pos = [], movies_offset
+        for _ in range(5):
+            col, pos = self._column(pos, 'I', movie_count)
+            cols.append(col)
+        self._movie_cols = cols
+
+        cols, pos = [], showtimes_offset
+        for fmt in _SHOWTIME_COLUMNS:
+            col, pos = self._column(pos, fmt, showtime_count)
+            cols.append(col)
+        self._showtime_cols = cols
+
+        self._seat_bits = self._buffer[seats_offset:seats_offset + seats_length]
+        self._layouts: Dict[int, List[str]] = {}
+        self._intents = (intents_offset, intents_length)
+        self._pattern_tokens: Optional[Mapping] = None
+        self.movies = _RecordView(self, self._movie_cols[0], self._movie)
+        self.showtimes = _RecordView(self, self._showtime_cols[0], self._showtime)
+
+    def _column(self, offset: int, fmt: str, count: int) -> Tuple[memoryview, int]:
+        """Zero-copy typed view of a column, plus the aligned offset after it"""
+        size = struct.calcsize(fmt) * count
+        column = self._buffer[offset:offset + size].cast(fmt)
+        return column, offset + size + (-size % 8)
+
+    def string(self, index: int) -> str:
+        start, end = self._string_offsets[index], self._string_offsets[index + 1]
+        return str(self._string_blob[start:end], 'utf-8')
+
+    def _movie(self, row: int) -> Movie:
+        ids, titles, durations, languages, genres = self._movie_cols
+        return Movie(
+            self.string(ids[row]), self.string(titles[row]), durations[row],
+            self.string(languages[row]), self.string(genres[row])
+        )
+
+    def _layout(self, index: int) -> List[str]:
+        # Layouts are shared by many showtimes, so decode each one once
+        layout = self._layouts.get(index)
+        if layout is None:
+            joined = self.string(index)
+            layout = joined.split(",") if joined else []
+            self._layouts[index] = layout
+        return layout
+
+    def _available(self, row: int) -> List[str]:
+        layout = self._layout(self._showtime_cols[4][row])
+        start = self._showtime_cols[5][row]
+        bits = self._seat_bits[start:start + (len(layout) + 7) // 8]
+        return [seat for i, seat in enumerate(layout) if bits[i >> 3] >> (i & 7) & 1]
+
+    def _showtime(self, row: int) -> ShowTime:
+        ids, movie_ids, datetimes, prices = self._showtime_cols[:4]
+        return ShowTime(
+            self.string(ids[row]), self.string(movie_ids[row]),
+            _from_micros(datetimes[row]), self._available(row), prices[row]
+        )
+
+    def seat_layout(self, showtime_id: str) -> List[str]:
+        """All seats of a showtime's auditorium, booked or not"""
+        row = self.showtimes._find(showtime_id)
+        return list(self._layout(self._showtime_cols[4][row]))
+
+    def showtimes_for_movie(self, movie_id: str) -> List[ShowTime]:
+        """Showtimes of one movie in time order, using the by-movie index"""
+        movie_ids, by_movie = self._showtime_cols[1], self._showtime_cols[6]
+        lo, hi = 0, len(by_movie)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.string(movie_ids[by_movie[mid]]) < movie_id:
+                lo = mid + 1
+            else:
+                hi = mid
+
+        result = []
+        while lo < len(by_movie) and self.string(movie_ids[by_movie[lo]]) == movie_id:
+            result.append(self._showtime(by_movie[lo]))
+            lo += 1
+        return result
+
+    @property
+    def pattern_tokens(self) -> Mapping:
+        """Compiled intent pattern tokens stored by the parent process.
+
+        Parsed once per catalog; the read-only mapping is shared by every
+        session using this catalog.
+        """
+        if self._pattern_tokens is None:
+            offset, length = self._intents
+            tokens = json.loads(str(self._buffer[offset:offset + length], 'utf-8'))
+            self._pattern_tokens = MappingProxyType(tokens)
+        return self._pattern_tokens
+
+    def close(self) -> None:
+        """Release the memory map (record views must not be used afterwards)"""
+        for col in self._movie_cols + self._showtime_cols:
+            col.release()
+        self._string_offsets.release()
+        self._string_blob.release()
+        self._seat_bits.release()
+        self._buffer.release()
+        self._mmap.close()
+
+    def __enter__(self) -> 'MappedCatalog':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
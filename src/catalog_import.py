@@ -0,0 +1,142 @@
+"""
+Convert CSV or JSON schedules into a binary catalog file.
+
+CSV input is a pair of files:
+    movies.csv      id,title,duration,language,genre
+    showtimes.csv   id,movie_id,datetime,price,seats[,booked]
+where datetime is ISO 8601 and seats/booked are space-separated seat IDs.
+Times without an offset are taken as local time, the zone the chatbot
+compares showtimes in; times with an offset are converted to local time. Every showtime must refer to a movie in the input.
+
+JSON input is a single file:
+    {"movies": [{"id": ..., "title": ..., ...}],
+     "showtimes": [{"id": ..., "movie_id": ..., "datetime": ..., "price": ...,
+                    "seats": [...], "booked": [...]}]}
+
+Usage:
+    python -m src.catalog_import movies.csv showtimes.csv -o catalog.bin
+    python -m src.catalog_import schedule.json -o catalog.bin
+"""
+
+import argparse
+import csv
+import json
+import time
+from datetime import datetime
+from typing import Dict, Iterator, Set, Tuple
+from .catalog import MappedCatalog, ShowTimeRecord, write_records
+from .models import Movie
+
+
+def _movie(row: Dict) -> Movie:
+    return Movie(row['id'], row['title'], int(row['duration']), row['language'], row['genre'])
+
+
+def _datetime(value: str) -> datetime:
+    """Parse an ISO 8601 datetime as naive local time, like datetime.now()"""
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone().replace(tzinfo=None)
+    return parsed
+
+
+def _csv_showtime(row: Dict) -> ShowTimeRecord:
+    booked = (row.get('booked') or '').split()
+    return (
+        row['id'], row['movie_id'], _datetime(row['datetime']),
+        float(row['price']), row['seats'].split(), set(booked) or None
+    )
+
+
+def _json_showtime(row: Dict) -> ShowTimeRecord:
+    return (
+        row['id'], row['movie_id'], _datetime(row['datetime']),
+        float(row['price']), row['seats'], set(row.get('booked', [])) or None
+    )
+
+
+def _parse(path: str, location: str, parse, row: Dict):
+    """Parse one input row, naming the file and line on failure"""
+    try:
+        return parse(row)
+    except (KeyError, TypeError, ValueError) as e:
+        raise ValueError(f"{path}, {location}: invalid record ({type(e).__name__}: {e})") from e
+
+
+def _check_movie(path: str, location: str, record: ShowTimeRecord, movie_ids: Set[str]) -> ShowTimeRecord:
+    # The catalog writer reads every movie before the first showtime, so
+    # movie_ids is complete by the time showtimes are checked
+    if record[1] not in movie_ids:
+        raise ValueError(f"{path}, {location}: showtime {record[0]} refers to unknown movie {record[1]}")
+    return record
+
+
+def read_csv(movies_path: str, showtimes_path: str) -> Tuple[Iterator[Movie], Iterator[ShowTimeRecord]]:
+    """Stream movies and showtime records from a pair of CSV files"""
+    movie_ids: Set[str] = set()
+
+    def movies() -> Iterator[Movie]:
+        with open(movies_path, newline='', encoding='utf-8') as f:
+            for line, row in enumerate(csv.DictReader(f), 2):
+                movie = _parse(movies_path, f"line {line}", _movie, row)
+                movie_ids.add(movie.id)
+                yield movie
+
+    def showtimes() -> Iterator[ShowTimeRecord]:
+        with open(showtimes_path, newline='', encoding='utf-8') as f:
+            for line, row in enumerate(csv.DictReader(f), 2):
+                location = f"line {line}"
+                record = _parse(showtimes_path, location, _csv_showtime, row)
+                yield _check_movie(showtimes_path, location, record, movie_ids)
+
+    return movies(), showtimes()
+
+
+def read_json(path: str) -> Tuple[Iterator[Movie], Iterator[ShowTimeRecord]]:
+    """Read movies and showtime records from a JSON schedule"""
+    with open(path, encoding='utf-8') as f:
+        data = json.load(f)
+
+    movies = [
+        _parse(path, f"movies[{i}]", _movie, row)
+        for i, row in enumerate(data.get('movies', []))
+    ]
+    movie_ids = {movie.id for movie in movies}
+
+    def showtimes() -> Iterator[ShowTimeRecord]:
+        for i, row in enumerate(data.get('showtimes', [])):
+            location = f"showtimes[{i}]"
+            record = _parse(path, location, _json_showtime, row)
+            yield _check_movie(path, location, record, movie_ids)
+
+    return iter(movies), showtimes()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build a binary movie catalog from CSV or JSON")
+    parser.add_argument('inputs', nargs='+', help="schedule.json, or movies.csv showtimes.csv")
+    parser.add_argument('-o', '--output', default='catalog.bin', help="catalog file to write")
+    args = parser.parse_args()
+
+    if len(args.inputs) not in (1, 2):
+        parser.error("expected one JSON file or two CSV files")
+
+    start = time.perf_counter()
+    try:
+        if len(args.inputs) == 1:
+            movies, showtimes = read_json(args.inputs[0])
+        else:
+            movies, showtimes = read_csv(*args.inputs)
+        write_records(args.output, movies, showtimes)
+    except ValueError as e:
+        raise SystemExit(f"Import failed: {e}")
+    print(f"Wrote {args.output} in {time.perf_counter() - start:.2f}s")
+
+    start = time.perf_counter()
+    with MappedCatalog(args.output) as catalog:
+        print(f"{len(catalog.movies)} movies, {len(catalog.showtimes)} showtimes, "
+              f"opened in {(time.perf_counter() - start) * 1000:.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
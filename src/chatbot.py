@@ -8,18 +8,63 @@ import os
 import time
 import re
 import time as time_module
-from typing import Optional, Dict, List, Any
+import asyncio
+import copy
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Optional, Dict, List, Any, Callable, Hashable, Mapping, Set
 from .models import Intent, ConversationTurn
+from .response_cache import NAME_PLACEHOLDER, depends_on, normalize_input, shared_response_cache
+from .spelling import SpellingIndex, vocabulary_words
+
+TIMEOUT_RESPONSE = "Sorry, that took too long to process. Could you try again?"
+
+# Per-process chatbots used by process pool workers for intent matching,
+# keyed by the (factory, args) spec that builds them
+_worker_bots: Dict[tuple, 'ChatBot'] = {}
+
+def _default_matcher(bot_class: type) -> 'ChatBot':
+    return bot_class(user_data_file=None)
+
+def _worker_matcher(spec: tuple) -> 'ChatBot':
+    """Intent matcher for a spec, built on first use in this process"""
+    bot = _worker_bots.get(spec)
+    if bot is None:
+        factory, args = spec
+        bot = _worker_bots[spec] = factory(*args)
+    return bot
+
+def _init_worker(bot_class: type) -> None:
+    """Build the default intent matcher once per process pool worker"""
+    _worker_matcher((_default_matcher, (bot_class,)))
+
+def _worker_match_intent(spec: tuple, text: str) -> Intent:
+    """Match intent inside a process pool worker"""
+    return _worker_matcher(spec).match_intent(text)
+
+# Spelling indexes already built in this process, by _matching_key(), so new
+# sessions skip collecting and hashing the vocabulary
+_spelling_indexes: Dict[Hashable, SpellingIndex] = {}
+
+def _is_dictionary_word(word: str) -> bool:
+    """Whether WordNet knows a word, including inflections such as 'seats'"""
+    try:
+        return bool(wordnet.synsets(word))
+    except Exception:
+        return False
 
 class ChatBot:
-    def __init__(self):
+    def __init__(self, user_data_file: Optional[str] = "user_data.json",
+                 executor: Optional[Executor] = None,
+                 async_timeout: Optional[float] = None,
+                 spelling_cache_file: Optional[str] = "spelling_index.json"):
         # Initialize NLP tools
         self.lemmatizer = WordNetLemmatizer()
         self.stop_words = set(stopwords.words('english'))
         self.punctuation = set(string.punctuation)
         
         # Initialize conversation state
-        self.user_data_file = "user_data.json"
+        self.user_data_file = user_data_file
         self.user_name = self.load_user_data()
         self.conversation_history: List[ConversationTurn] = []
         self.session_start = time_module.time()
@@ -27,6 +72,33 @@ class ChatBot:
 
         # Load intent patterns from separate config file
         self.intent_patterns = self._load_intent_patterns()
+        self._pattern_token_cache: Dict[str, List[str]] = {}
+        # Read-only tokens compiled elsewhere (e.g. a shared catalog), checked first
+        self._shared_pattern_tokens: Mapping[str, List[str]] = {}
+
+        # Spelling index is built on first use, once subclasses have added their patterns
+        self.spelling_cache_file = spelling_cache_file
+        self._spelling_index: Optional[SpellingIndex] = None
+
+        # Async processing settings (None executor means the loop's default thread pool)
+        self.executor = executor
+        self.async_timeout = async_timeout
+        self._turn_lock: Optional[asyncio.Lock] = None
+        # Guards conversation state against background tasks such as compaction
+        self._state_lock = threading.RLock()
+
+    @classmethod
+    def create_process_pool(cls, max_workers: Optional[int] = None) -> ProcessPoolExecutor:
+        """Create a process pool whose workers build their intent matcher up front.
+
+        Any ProcessPoolExecutor works as ``executor``; workers of other pools
+        build the matcher on their first turn instead.
+        """
+        return ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=_init_worker,
+            initargs=(cls,)
+        )
 
     def _load_intent_patterns(self) -> Dict[str, Dict[str, List[str]]]:
         """Load intent patterns from configuration file"""
@@ -67,6 +139,8 @@ class ChatBot:
 
     def load_user_data(self) -> Optional[str]:
         """Load user data from JSON file"""
+        if self.user_data_file is None:
+            return None
         try:
             if os.path.exists(self.user_data_file):
                 with open(self.user_data_file, 'r') as f:
@@ -81,6 +155,8 @@ class ChatBot:
 
     def save_user_data(self) -> bool:
         """Save user data to JSON file"""
+        if self.user_data_file is None:
+            return True
         try:
             data = {'name': self.user_name}
             with open(self.user_data_file, 'w') as f:
@@ -108,6 +184,7 @@ class ChatBot:
     def match_intent(self, text: str) -> Intent:
         """Match input text to an intent with improved confidence scoring"""
         try:
+            text = self.correct_spelling(text)
             tokens = self.preprocess_text(text)
             if not tokens:
                 return Intent.UNKNOWN
@@ -128,7 +205,7 @@ class ChatBot:
                         break
                         
                     # Token similarity check
-                    pattern_tokens = self.preprocess_text(pattern)
+                    pattern_tokens = self._get_pattern_tokens(pattern)
                     if pattern_tokens:
                         similarity = self._calculate_token_similarity(tokens, pattern_tokens)
                         max_pattern_score = max(max_pattern_score, similarity)
@@ -143,6 +220,49 @@ class ChatBot:
             print(f"Error matching intent: {e}")
             return Intent.UNKNOWN
 
+    def _spelling_vocabulary(self) -> List[str]:
+        """Phrases whose words are valid spelling corrections"""
+        phrases = []
+        for intent in self.intent_patterns.values():
+            phrases.extend(p for p in intent.get('patterns', []) if not p.startswith('{'))
+        return phrases
+
+    def _spelling_known_words(self) -> Set[str]:
+        """Correctly spelled words that are left alone and never used as corrections"""
+        return set(self.stop_words)
+
+    def correct_spelling(self, text: str) -> str:
+        """Fix typos such as 'shwo movies' before intent matching"""
+        if self._spelling_index is None:
+            key = self._matching_key()
+            index = _spelling_indexes.get(key)
+            if index is None:
+                index = SpellingIndex.load(
+                    vocabulary_words(self._spelling_vocabulary()), self.spelling_cache_file,
+                    known_words=self._spelling_known_words(), is_word=_is_dictionary_word
+                )
+                _spelling_indexes[key] = index
+            self._spelling_index = index
+        return self._spelling_index.correct(text)
+
+    def _get_pattern_tokens(self, pattern: str) -> List[str]:
+        """Preprocess an intent pattern once and reuse the tokens"""
+        tokens = self._shared_pattern_tokens.get(pattern)
+        if tokens is None:
+            tokens = self._pattern_token_cache.get(pattern)
+        if tokens is None:
+            tokens = self.preprocess_text(pattern)
+            self._pattern_token_cache[pattern] = tokens
+        return tokens
+
+    def compile_intent_patterns(self) -> Dict[str, List[str]]:
+        """Preprocess every intent pattern, e.g. to share them with worker processes"""
+        return {
+            pattern: self._get_pattern_tokens(pattern)
+            for intent in self.intent_patterns.values()
+            for pattern in intent.get('patterns', [])
+        }
+
     def _calculate_token_similarity(self, tokens1: List[str], tokens2: List[str]) -> float:
         """Calculate similarity between two sets of tokens"""
         if not tokens1 or not tokens2:
@@ -163,41 +283,165 @@ class ChatBot:
     def process_input(self, user_input: str) -> str:
         """Process user input and generate appropriate response"""
         try:
-            intent = self.match_intent(user_input)
-            
-            # Log the interaction
-            self.conversation_history.append(ConversationTurn(
-                timestamp=time.time(),
-                user_input=user_input,
-                response="",  # Will be set after processing
-                intent=intent
-            ))
-            
-            response = self._handle_intent(intent, user_input)
-            
-            # Update the response in history
-            self.conversation_history[-1].response = response
-            return response
+            intent = self._cached_intent(user_input)
+            if intent is None:
+                intent = self.match_intent(user_input)
+            return self._respond(intent, user_input)
             
         except Exception as e:
             print(f"Error processing input: {e}")
             return "I'm having trouble processing your request. Could you try again?"
 
-    def _handle_intent(self, intent: Intent, user_input: str) -> str:
-        """Handle different intents with improved logic"""
-        if self.awaiting_name_confirmation:
-            return self._handle_name_confirmation(intent, user_input)
-            
-        handlers = {
+    async def aprocess_input(self, user_input: str, timeout: Optional[float] = None) -> str:
+        """Async counterpart of process_input for use inside an event loop.
+
+        Intent matching runs on ``self.executor`` so NLTK never blocks the loop.
+        Turns are serialized per chatbot instance (one instance per session) and
+        state only changes after matching completes, so a turn that times out or
+        is cancelled leaves the conversation and booking state untouched. The
+        timeout includes time spent waiting for earlier turns of the session.
+        """
+        if self._turn_lock is None:
+            self._turn_lock = asyncio.Lock()
+        if timeout is None:
+            timeout = self.async_timeout
+
+        # One deadline covers both waiting for earlier turns and matching
+        loop = asyncio.get_running_loop()
+        deadline = None if timeout is None else loop.time() + timeout
+        if not await self._acquire_turn(timeout):
+            return TIMEOUT_RESPONSE
+
+        try:
+            intent = self._cached_intent(user_input)
+            if intent is None:
+                if isinstance(self.executor, ProcessPoolExecutor):
+                    future = loop.run_in_executor(
+                        self.executor, _worker_match_intent, self._matcher_spec(), user_input
+                    )
+                else:
+                    future = loop.run_in_executor(self.executor, self.match_intent, user_input)
+                remaining = None if deadline is None else max(0.0, deadline - loop.time())
+                intent = await asyncio.wait_for(future, remaining)
+            return self._respond(intent, user_input)
+        except asyncio.TimeoutError:
+            return TIMEOUT_RESPONSE
+        except Exception as e:
+            print(f"Error processing input: {e}")
+            return "I'm having trouble processing your request. Could you try again?"
+        finally:
+            self._turn_lock.release()
+
+    def _matcher_spec(self) -> tuple:
+        """Picklable (factory, args) that builds an equivalent intent matcher in a worker"""
+        return _default_matcher, (type(self),)
+
+    async def _acquire_turn(self, timeout: Optional[float]) -> bool:
+        """Wait for this session's turn lock, giving up after timeout seconds"""
+        acquire = asyncio.ensure_future(self._turn_lock.acquire())
+        try:
+            await asyncio.wait({acquire}, timeout=timeout)
+        finally:
+            if not acquire.done():
+                acquire.cancel()
+                # If the lock is granted just as we give up, hand it straight back
+                acquire.add_done_callback(
+                    lambda f: f.cancelled() or f.exception() or self._turn_lock.release()
+                )
+        return acquire.done() and not acquire.cancelled()
+
+    def _respond(self, intent: Intent, user_input: str) -> str:
+        """Log the turn and run the handler for an already matched intent"""
+        with self._state_lock:
+            return self._respond_locked(intent, user_input)
+
+    def _respond_locked(self, intent: Intent, user_input: str) -> str:
+        # Log the interaction
+        self.conversation_history.append(ConversationTurn(
+            timestamp=time.time(),
+            user_input=user_input,
+            response="",  # Will be set after processing
+            intent=intent
+        ))
+        
+        handler = self._resolve_handler(intent)
+        if handler is not None and hasattr(handler, 'response_dependencies'):
+            # Remember the intent so repeats of this input skip classification
+            shared_response_cache.put(('intent', self._matching_key(), normalize_input(user_input)), intent)
+            response = self._cached_response(handler, user_input)
+        else:
+            response = self._handle_intent(intent, user_input)
+        
+        # Update the response in history
+        self.conversation_history[-1].response = response
+        return response
+
+    def _cached_intent(self, user_input: str) -> Optional[Intent]:
+        """Intent of a previously seen input whose response is cacheable"""
+        return shared_response_cache.get(('intent', self._matching_key(), normalize_input(user_input)))
+
+    def _matching_key(self) -> Hashable:
+        """Identifies everything intent matching depends on besides the input"""
+        return type(self)
+
+    def _cached_response(self, handler: Callable[[str], str], user_input: str) -> str:
+        """Serve a cacheable handler's response from the shared cache"""
+        dependencies = handler.response_dependencies
+        key = (
+            'response', type(self), handler.__name__, normalize_input(user_input),
+            tuple(self._response_dependency(name) for name in dependencies)
+        )
+        template = shared_response_cache.get(key)
+        if template is None:
+            template = self._render_template(handler, user_input, dependencies)
+            shared_response_cache.put(key, template)
+
+        if self.user_name:
+            return template.replace(NAME_PLACEHOLDER, self.user_name)
+        return template
+
+    def _response_dependency(self, name: str) -> Any:
+        """Value of a declared dependency as used in cache keys"""
+        if name == 'user_name':
+            # The name itself is substituted into the template, only its presence matters
+            return bool(self.user_name)
+        return getattr(self, name)
+
+    def _render_template(self, handler: Callable[[str], str], user_input: str,
+                         dependencies: tuple) -> str:
+        """Run a handler with the user's name replaced by a placeholder"""
+        if 'user_name' not in dependencies or not self.user_name:
+            return handler(user_input)
+
+        # Render on a shallow copy so this session's name is never swapped out
+        view = copy.copy(self)
+        view.user_name = NAME_PLACEHOLDER
+        view.user_data_file = None  # Never persist the placeholder
+        return handler.__func__(view, user_input)
+
+    def _intent_handlers(self) -> Dict[Intent, Callable[[str], str]]:
+        """Map intents to their handlers"""
+        return {
             Intent.NAME_SET: self._handle_name_set,
             Intent.NAME_GET: self._handle_name_get,
             Intent.FAREWELL: self._handle_farewell,
             Intent.GREETING: self._handle_greeting,
             Intent.HELP: self._handle_help,
-            Intent.UNKNOWN: lambda _: "I'm not sure what you mean. Could you rephrase that?"
+            Intent.UNKNOWN: self._handle_unknown
         }
-        
-        handler = handlers.get(intent, handlers[Intent.UNKNOWN])
+
+    def _resolve_handler(self, intent: Intent) -> Optional[Callable[[str], str]]:
+        """Handler _handle_intent will run, or None while confirming the user's name"""
+        if self.awaiting_name_confirmation:
+            return None
+        return self._intent_handlers().get(intent, self._handle_unknown)
+
+    def _handle_intent(self, intent: Intent, user_input: str) -> str:
+        """Handle different intents with improved logic"""
+        if self.awaiting_name_confirmation:
+            return self._handle_name_confirmation(intent, user_input)
+            
+        handler = self._resolve_handler(intent)
         return handler(user_input)
     
     def get_word_similarity(self, word1: str, word2: str) -> float:
@@ -284,24 +528,28 @@ class ChatBot:
             return f"Nice to meet you, {name}!"
         return "I didn't catch your name. Could you say it again?"
 
+    @depends_on('user_name')
     def _handle_name_get(self, user_input: str) -> str:
         """Handle name getting intent"""
         if self.user_name:
             return f"Your name is {self.user_name}!"
         return "I don't know your name yet. Would you like to tell me?"
 
+    @depends_on('user_name')
     def _handle_farewell(self, user_input: str) -> str:
         """Handle farewell intent"""
         if self.user_name:
             return f"Goodbye {self.user_name}! Have a great day!"
         return "Goodbye! Have a great day!"
 
+    @depends_on('user_name')
     def _handle_greeting(self, user_input: str) -> str:
         """Handle greeting intent"""
         if self.user_name:
             return f"Hello {self.user_name}! How can I help you today?"
         return "Hello! Would you like to tell me your name?"
 
+    @depends_on('user_name')
     def _handle_help(self, user_input: str) -> str:
         """Handle help intent"""
         help_message = (
@@ -312,8 +560,22 @@ class ChatBot:
             f"{'4. Continuing our previous conversation' if self.user_name else '4. Getting to know you better'}"
         )
         return help_message
+
+    @depends_on()
+    def _handle_unknown(self, user_input: str) -> str:
+        """Handle input that matched no intent"""
+        return "I'm not sure what you mean. Could you rephrase that?"
     
     def _get_capabilities_message(self) -> str:
+        """Capabilities message, built once per chatbot class"""
+        key = ('capabilities', type(self))
+        message = shared_response_cache.get(key)
+        if message is None:
+            message = self._build_capabilities_message()
+            shared_response_cache.put(key, message)
+        return message
+
+    def _build_capabilities_message(self) -> str:
         """Get a friendly message about the chatbot's capabilities"""
         return (
             "I'm here to help you! I can:\n"
@@ -0,0 +1,130 @@
+"""
+Seat inventory shared by every chatbot session.
+
+A single SeatInventory is the source of truth for which seats are still free
+and for issuing booking IDs. Within one process the chatbot uses it directly;
+across processes it is served by an InventoryManager and sessions talk to it
+through a proxy.
+"""
+
+import threading
+from collections.abc import Mapping
+from datetime import datetime
+from multiprocessing.managers import BaseManager
+from typing import Callable, Dict, Iterable, List, Optional, Set
+from .catalog import MappedCatalog
+from .seat_allocator import SeatAllocator
+
+
+class SeatInventory:
+    """Thread-safe seat availability and booking ID allocation"""
+
+    def __init__(self, showtimes: Mapping,
+                 seat_layout: Optional[Callable[[str], List[str]]] = None):
+        self._lock = threading.Lock()
+        self._showtimes = showtimes
+        # Full auditorium layout per showtime; defaults to the seats free at first use
+        self._seat_layout = seat_layout
+        # Lists are taken from the showtimes on first use, so in-memory
+        # ShowTime objects stay in sync with the inventory
+        self._available: Dict[str, List[str]] = {}
+        self._allocator = SeatAllocator()
+        # Archived showtimes; a catalog still lists them, so never reload their seats
+        self._retired: Set[str] = set()
+        self._booking_count = 0
+
+    def _seats(self, showtime_id: str) -> List[str]:
+        if showtime_id in self._retired:
+            return []
+        if showtime_id not in self._available:
+            available = self._showtimes[showtime_id].available_seats
+            layout = self._seat_layout(showtime_id) if self._seat_layout else available
+            self._available[showtime_id] = available
+            self._allocator.add_showtime(showtime_id, layout, available)
+        return self._available[showtime_id]
+
+    def available_seats(self, showtime_id: str) -> List[str]:
+        """Return a snapshot of the free seats for a showtime"""
+        with self._lock:
+            return list(self._seats(showtime_id))
+
+    def reserve(self, showtime_id: str, seats: List[str]) -> bool:
+        """Take all of the given seats, or none of them if any is already gone"""
+        with self._lock:
+            available = self._seats(showtime_id)
+            if showtime_id in self._retired:
+                return False
+            if len(set(seats)) != len(seats) or not set(seats).issubset(available):
+                return False
+            for seat in seats:
+                available.remove(seat)
+            self._allocator.hold(showtime_id, seats)
+            return True
+
+    def release(self, showtime_id: str, seats: List[str]) -> None:
+        """Return seats to the available pool"""
+        with self._lock:
+            if showtime_id in self._retired:
+                return
+            available = self._seats(showtime_id)
+            available.extend(seat for seat in seats if seat not in available)
+            available.sort()
+            self._allocator.release(showtime_id, seats)
+
+    def best_adjacent(self, showtime_id: str, count: int) -> Optional[List[str]]:
+        """Best free block of count adjacent seats, nearest the centre, or None"""
+        with self._lock:
+            if showtime_id in self._retired:
+                return None
+            self._seats(showtime_id)
+            return self._allocator.best_adjacent(showtime_id, count)
+
+    def showtimes_with_adjacent(self, count: int, showtime_ids: Iterable[str]) -> List[str]:
+        """Those of showtime_ids that still have count adjacent free seats"""
+        showtime_ids = list(showtime_ids)
+        with self._lock:
+            for showtime_id in showtime_ids:
+                self._seats(showtime_id)
+            matches = self._allocator.showtimes_with_adjacent(count, showtime_ids)
+        return [showtime_id for showtime_id in showtime_ids if showtime_id in matches]
+
+    def forget(self, showtime_ids: Iterable[str]) -> None:
+        """Drop seat state for showtimes that have been archived"""
+        with self._lock:
+            self._forget(showtime_ids)
+
+    def forget_past(self, cutoff: datetime) -> List[str]:
+        """Drop seat state for showtimes that started before cutoff and return their IDs"""
+        with self._lock:
+            # Only showtimes with loaded seat state are checked, not the whole catalog
+            past = [
+                showtime_id for showtime_id in self._available
+                if self._showtimes[showtime_id].datetime < cutoff
+            ]
+            self._forget(past)
+        return past
+
+    def _forget(self, showtime_ids: Iterable[str]) -> None:
+        for showtime_id in showtime_ids:
+            self._available.pop(showtime_id, None)
+            self._allocator.remove_showtime(showtime_id)
+            self._retired.add(showtime_id)
+
+    def next_booking_id(self) -> str:
+        """Issue a booking ID that is unique across all sessions"""
+        with self._lock:
+            self._booking_count += 1
+            return f"BK{self._booking_count}"
+
+
+def _catalog_inventory(catalog_path: str) -> SeatInventory:
+    """Build an inventory over a catalog file inside the manager process"""
+    catalog = MappedCatalog(catalog_path)
+    return SeatInventory(catalog.showtimes, catalog.seat_layout)
+
+
+class InventoryManager(BaseManager):
+    """Manager process that serves one SeatInventory to worker processes"""
+
+
+InventoryManager.register('SeatInventory', _catalog_inventory)
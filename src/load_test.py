@@ -0,0 +1,283 @@
+"""
+Load generator for booking contention.
+
+Spawns many simulated users, each running a randomized booking dialog against
+a small set of popular showtimes, and checks that the shared seat inventory
+stays consistent. Users can be driven by threads or asyncio tasks against
+in-process chatbots, or through a WorkerPool of server processes.
+
+Usage:
+    python -m src.load_test --users 2000 --mode threads --concurrency 32
+    python -m src.load_test --users 2000 --mode asyncio
+    python -m src.load_test --users 2000 --mode processes --workers 4
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+from .catalog import MappedCatalog, write_catalog
+from .inventory import SeatInventory
+from .movie_booking import MovieBookingChatBot
+from .worker_pool import WorkerPool
+
+BOOKED_PREFIX = "Booking confirmed!"
+CONFLICT_PREFIX = "Sorry, some of those seats have just been booked"
+
+
+@dataclass
+class Dialog:
+    user_id: str
+    showtime_id: str
+    seats: List[str]
+    turns: List[str]
+
+
+@dataclass
+class DialogResult:
+    dialog: Dialog
+    outcome: str  # BOOKED, CONFLICT or FAILED
+    seats: List[str] = field(default_factory=list)
+    latencies: List[float] = field(default_factory=list)
+
+
+@dataclass
+class LoadReport:
+    users: int
+    elapsed: float
+    booked: int
+    conflicts: int
+    failed: int
+    latency_percentiles: Dict[int, float]
+    violations: List[str]
+
+    def summary(self) -> str:
+        percentiles = ", ".join(
+            f"p{p}={ms:.1f}ms" for p, ms in self.latency_percentiles.items()
+        )
+        attempts = self.booked + self.conflicts
+        lines = [
+            f"Users: {self.users} in {self.elapsed:.2f}s",
+            f"Bookings: {self.booked} ({self.booked / self.elapsed:.1f}/sec)",
+            f"Conflicts: {self.conflicts} ({self.conflicts / attempts if attempts else 0:.1%} of attempts)",
+            f"Failed dialogs: {self.failed}",
+            f"Turn latency: {percentiles}",
+        ]
+        if self.violations:
+            lines.append("Invariant violations:")
+            lines.extend(f"- {violation}" for violation in self.violations)
+        else:
+            lines.append("Invariants: OK (no seat sold twice, seat counts conserved)")
+        return "\n".join(lines)
+
+
+def make_dialog(rng: random.Random, user_id: str, catalog: MappedCatalog,
+                showtime_ids: List[str]) -> Dialog:
+    """Build a randomized booking dialog aimed at one of the popular showtimes"""
+    showtime = catalog.showtimes[rng.choice(showtime_ids)]
+    movie = catalog.movies[showtime.movie_id]
+    layout = catalog.seat_layout(showtime.id)
+    seats = rng.sample(layout, rng.randint(1, min(3, len(layout))))
+
+    turns = [f"My name is {user_id}"] if rng.random() < 0.5 else []
+    turns += [
+        f"Book {movie.title}",
+        f"What time? {showtime.datetime.strftime('%I:%M %p')}",
+        f"Select seat {' and '.join(seats)}",
+        "Proceed to pay",
+    ]
+    return Dialog(user_id, showtime.id, seats, turns)
+
+
+def _classify(responses: List[str]) -> Tuple[str, List[str]]:
+    """Work out how a dialog ended from the bot's last response"""
+    last = responses[-1] if responses else ""
+    if last.startswith(BOOKED_PREFIX):
+        for line in last.splitlines():
+            if line.startswith("Seats: "):
+                return "BOOKED", line[len("Seats: "):].split(", ")
+    if last.startswith(CONFLICT_PREFIX) or (len(responses) > 1 and responses[-2].startswith("Available seats")):
+        # Seats were taken either before selection or between selection and payment
+        return "CONFLICT", []
+    return "FAILED", []
+
+
+def _run_dialog(dialog: Dialog, send: Callable[[str], str]) -> DialogResult:
+    responses, latencies = [], []
+    for turn in dialog.turns:
+        start = time.perf_counter()
+        responses.append(send(turn))
+        latencies.append(time.perf_counter() - start)
+    outcome, seats = _classify(responses)
+    return DialogResult(dialog, outcome, seats, latencies)
+
+
+async def _run_dialog_async(dialog: Dialog, bot: MovieBookingChatBot) -> DialogResult:
+    responses, latencies = [], []
+    for turn in dialog.turns:
+        start = time.perf_counter()
+        responses.append(await bot.aprocess_input(turn))
+        latencies.append(time.perf_counter() - start)
+    outcome, seats = _classify(responses)
+    return DialogResult(dialog, outcome, seats, latencies)
+
+
+def check_invariants(results: List[DialogResult], catalog: MappedCatalog,
+                     inventory, showtime_ids: List[str]) -> List[str]:
+    """Check that no seat was sold twice and seat counts are conserved"""
+    violations = []
+    sold: Dict[str, List[str]] = {showtime_id: [] for showtime_id in showtime_ids}
+    for result in results:
+        if result.outcome == "BOOKED":
+            sold[result.dialog.showtime_id].extend(result.seats)
+
+    for showtime_id, seats in sold.items():
+        layout = catalog.seat_layout(showtime_id)
+        initial = set(catalog.showtimes[showtime_id].available_seats)
+        available = inventory.available_seats(showtime_id)
+
+        duplicates = sorted({seat for seat in seats if seats.count(seat) > 1})
+        if duplicates:
+            violations.append(f"{showtime_id}: seats sold more than once: {', '.join(duplicates)}")
+        both = sorted(set(seats) & set(available))
+        if both:
+            violations.append(f"{showtime_id}: sold seats still available: {', '.join(both)}")
+        if len(seats) + len(available) != len(initial):
+            violations.append(
+                f"{showtime_id}: {len(seats)} sold + {len(available)} available "
+                f"!= {len(initial)} initially free (layout {len(layout)})"
+            )
+    return violations
+
+
+def _percentiles(results: List[DialogResult]) -> Dict[int, float]:
+    latencies = sorted(latency for result in results for latency in result.latencies)
+    if not latencies:
+        return {}
+    return {
+        p: latencies[min(len(latencies) - 1, int(len(latencies) * p / 100))] * 1000
+        for p in (50, 90, 95, 99)
+    }
+
+
+class LoadTest:
+    """Drive many simulated users against a shared seat inventory"""
+
+    def __init__(self, users: int = 1000, mode: str = "threads",
+                 concurrency: int = 32, workers: Optional[int] = None,
+                 hot_shows: int = 2, seed: Optional[int] = None,
+                 catalog_path: Optional[str] = None):
+        self.users = users
+        self.mode = mode
+        self.concurrency = concurrency
+        self.workers = workers
+        self.hot_shows = hot_shows
+        self.rng = random.Random(seed)
+        self.catalog_path = catalog_path
+
+    def run(self) -> LoadReport:
+        with tempfile.TemporaryDirectory() as tmp:
+            catalog_path = self.catalog_path
+            if catalog_path is None:
+                catalog_path = os.path.join(tmp, "catalog.bin")
+                template = MovieBookingChatBot(user_data_file=None)
+                write_catalog(catalog_path, template.movies, template.showtimes,
+                              template.compile_intent_patterns())
+
+            catalog = MappedCatalog(catalog_path)
+            try:
+                showtime_ids = list(catalog.showtimes)[:self.hot_shows]
+                dialogs = [
+                    make_dialog(self.rng, f"User{n}", catalog, showtime_ids)
+                    for n in range(self.users)
+                ]
+
+                start = time.perf_counter()
+                if self.mode == "processes":
+                    results, violations = self._run_pool(catalog, catalog_path, dialogs, showtime_ids)
+                else:
+                    inventory = SeatInventory(catalog.showtimes, catalog.seat_layout)
+                    if self.mode == "asyncio":
+                        results = asyncio.run(self._run_asyncio(catalog, inventory, dialogs))
+                    else:
+                        results = self._run_threads(catalog, inventory, dialogs)
+                    violations = check_invariants(results, catalog, inventory, showtime_ids)
+                elapsed = time.perf_counter() - start
+            finally:
+                catalog.close()
+
+        return LoadReport(
+            users=self.users,
+            elapsed=elapsed,
+            booked=sum(r.outcome == "BOOKED" for r in results),
+            conflicts=sum(r.outcome == "CONFLICT" for r in results),
+            failed=sum(r.outcome == "FAILED" for r in results),
+            latency_percentiles=_percentiles(results),
+            violations=violations
+        )
+
+    def _new_bot(self, catalog: MappedCatalog, inventory: SeatInventory) -> MovieBookingChatBot:
+        return MovieBookingChatBot(catalog=catalog, inventory=inventory, user_data_file=None)
+
+    def _run_threads(self, catalog: MappedCatalog, inventory: SeatInventory,
+                     dialogs: List[Dialog]) -> List[DialogResult]:
+        def run(dialog: Dialog) -> DialogResult:
+            bot = self._new_bot(catalog, inventory)
+            return _run_dialog(dialog, bot.process_input)
+
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            return list(executor.map(run, dialogs))
+
+    async def _run_asyncio(self, catalog: MappedCatalog, inventory: SeatInventory,
+                           dialogs: List[Dialog]) -> List[DialogResult]:
+        executor = ThreadPoolExecutor(max_workers=self.concurrency)
+        try:
+            tasks = []
+            for dialog in dialogs:
+                bot = self._new_bot(catalog, inventory)
+                bot.executor = executor
+                tasks.append(_run_dialog_async(dialog, bot))
+            return await asyncio.gather(*tasks)
+        finally:
+            executor.shutdown()
+
+    def _run_pool(self, catalog: MappedCatalog, catalog_path: str, dialogs: List[Dialog],
+                  showtime_ids: List[str]) -> Tuple[List[DialogResult], List[str]]:
+        with WorkerPool(num_workers=self.workers, catalog_path=catalog_path,
+                        build_catalog=False) as pool:
+            def run(dialog: Dialog) -> DialogResult:
+                return _run_dialog(dialog, lambda text: pool.process_input(dialog.user_id, text))
+
+            with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+                results = list(executor.map(run, dialogs))
+            return results, check_invariants(results, catalog, pool.inventory, showtime_ids)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate many users booking the same shows")
+    parser.add_argument('--users', type=int, default=1000, help="number of simulated users")
+    parser.add_argument('--mode', choices=['threads', 'asyncio', 'processes'], default='threads')
+    parser.add_argument('--concurrency', type=int, default=32, help="users in flight at once")
+    parser.add_argument('--workers', type=int, help="server processes for --mode processes")
+    parser.add_argument('--hot-shows', type=int, default=2, help="number of popular showtimes")
+    parser.add_argument('--catalog', help="catalog file to use instead of the sample data")
+    parser.add_argument('--seed', type=int, help="random seed for reproducible dialogs")
+    args = parser.parse_args()
+
+    report = LoadTest(
+        users=args.users, mode=args.mode, concurrency=args.concurrency,
+        workers=args.workers, hot_shows=args.hot_shows, seed=args.seed,
+        catalog_path=args.catalog
+    ).run()
+    print(report.summary())
+    if report.violations:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
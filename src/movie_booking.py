@@ -1,7 +1,24 @@
 from .chatbot import ChatBot
 from .models import Movie, ShowTime, Booking, Intent
-from datetime import datetime
-from typing import Dict, Optional, List
+from .catalog import MappedCatalog
+from .inventory import SeatInventory
+from .response_cache import depends_on
+from .archive import BookingArchive
+from datetime import datetime, timedelta
+from typing import Dict, Optional, List, Callable, Set
+import copy
+import hashlib
+import re
+import threading
+
+NUMBER_WORDS = {
+    'one': 1, 'two': 2, 'three': 3, 'four': 4, 'five': 5,
+    'six': 6, 'seven': 7, 'eight': 8, 'nine': 9, 'ten': 10
+}
+
+def _catalog_matcher(bot_class: type, catalog_path: str, catalog_version: str) -> ChatBot:
+    """Intent matcher over a catalog file, built inside a process pool worker"""
+    return bot_class(catalog=MappedCatalog(catalog_path), user_data_file=None)
 
 class MovieBookingState:
     def __init__(self):
@@ -12,14 +29,35 @@ class MovieBookingState:
         self.current_step: str = "INIT"
 
 class MovieBookingChatBot(ChatBot):
-    def __init__(self):
-        super().__init__()
+    def __init__(self, catalog: Optional[MappedCatalog] = None,
+                 inventory: Optional[SeatInventory] = None,
+                 archive: Optional[BookingArchive] = None,
+                 archive_file: Optional[str] = None, **kwargs):
+        super().__init__(**kwargs)
         self.booking_state = MovieBookingState()
         
         # Load movie data (in practice, this would come from a database)
-        self.movies: Dict[str, Movie] = self._load_movies()
-        self.showtimes: Dict[str, ShowTime] = self._load_showtimes()
+        self.catalog = catalog
+        if catalog is not None:
+            # Shared read-only catalog built by a parent process
+            self.movies = catalog.movies
+            self.showtimes = catalog.showtimes
+            self._shared_pattern_tokens = catalog.pattern_tokens
+        else:
+            self.movies: Dict[str, Movie] = self._load_movies()
+            self.showtimes: Dict[str, ShowTime] = self._load_showtimes()
         self.bookings: Dict[str, Booking] = {}
+        # Optional cold tier for past showtimes and settled bookings
+        if archive is None and archive_file is not None:
+            archive = BookingArchive(archive_file)
+        self.archive = archive
+        self._compaction_lock = threading.Lock()
+        self.catalog_version = self._catalog_version()
+
+        # All seat mutations go through the inventory so sessions can share it
+        if inventory is None:
+            inventory = SeatInventory(self.showtimes, catalog.seat_layout if catalog else None)
+        self.inventory = inventory
         
         # Extend intent patterns
         self.intent_patterns.update(self._load_booking_intent_patterns())
@@ -56,6 +94,33 @@ class MovieBookingChatBot(ChatBot):
             }
         }
 
+    def _catalog_version(self) -> str:
+        """Identifies the movie data; recompute it after changing self.movies"""
+        if self.catalog is not None:
+            return self.catalog.version
+        movies = sorted(
+            (m.id, m.title, m.duration, m.language, m.genre) for m in self.movies.values()
+        )
+        return hashlib.sha1(repr(movies).encode('utf-8')).hexdigest()
+
+    def _matching_key(self) -> tuple:
+        """Spelling correction depends on the movie titles"""
+        return type(self), self.catalog_version
+
+    def _matcher_spec(self) -> tuple:
+        """Worker matchers open the same catalog, so spelling knows its titles"""
+        if self.catalog is None:
+            return super()._matcher_spec()
+        return _catalog_matcher, (type(self), self.catalog.path, self.catalog_version)
+
+    def _spelling_vocabulary(self) -> List[str]:
+        """Movie titles are valid corrections too"""
+        return super()._spelling_vocabulary() + [movie.title for movie in self.movies.values()]
+
+    def _spelling_known_words(self) -> Set[str]:
+        """Number words such as 'two' are used for group sizes, not typos"""
+        return super()._spelling_known_words() | set(NUMBER_WORDS)
+
     def _load_movies(self) -> Dict[str, Movie]:
         # Sample data - in practice, this would come from a database
         return {
@@ -75,6 +140,13 @@ class MovieBookingChatBot(ChatBot):
                           ["A1", "A2", "B1", "B2"], 14.99)
         }
 
+    def _showtimes_for_movie(self, movie_id: str) -> List[ShowTime]:
+        if self.catalog is not None:
+            # Indexed lookup instead of decoding every showtime in the catalog
+            return self.catalog.showtimes_for_movie(movie_id)
+        return [st for st in self.showtimes.values() if st.movie_id == movie_id]
+
+    @depends_on('catalog_version')
     def _handle_movie_search(self, user_input: str) -> str:
         movies_list = "\n".join(
             f"- {movie.title} ({movie.duration} mins, {movie.language})"
@@ -96,10 +168,7 @@ class MovieBookingChatBot(ChatBot):
         if not self.booking_state.selected_movie:
             return "Please select a movie first."
 
-        available_showtimes = [
-            st for st in self.showtimes.values()
-            if st.movie_id == self.booking_state.selected_movie.id
-        ]
+        available_showtimes = self._showtimes_for_movie(self.booking_state.selected_movie.id)
 
         if not available_showtimes:
             return "No showtimes available for this movie."
@@ -111,23 +180,63 @@ class MovieBookingChatBot(ChatBot):
                 self.booking_state.current_step = "SHOWTIME_SELECTED"
                 return f"Selected showtime: {time_str}. Would you like to select seats?"
 
+        if "tonight" in user_input.lower():
+            today = datetime.now().date()
+            available_showtimes = [
+                st for st in available_showtimes
+                if st.datetime.date() == today and st.datetime.hour >= 17
+            ]
+            if not available_showtimes:
+                return "There are no showtimes left tonight for this movie."
+
+        # Only list showtimes that can seat a group together if one was asked for
+        seat_count = self.extract_seat_count(user_input)
+        if seat_count:
+            with_seats = set(self.inventory.showtimes_with_adjacent(
+                seat_count, [st.id for st in available_showtimes]
+            ))
+            available_showtimes = [st for st in available_showtimes if st.id in with_seats]
+            if not available_showtimes:
+                return f"Sorry, no showtimes have {seat_count} seats together."
+
         # If no time was selected, show available times
         times_list = "\n".join(
-            f"- {st.datetime.strftime('%I:%M %p')} ({len(st.available_seats)} seats available)"
+            f"- {st.datetime.strftime('%I:%M %p')} ({len(self.inventory.available_seats(st.id))} seats available)"
             for st in available_showtimes
         )
         return f"Available showtimes:\n{times_list}"
 
+    def extract_seat_count(self, text: str) -> Optional[int]:
+        """Extract a group size such as 'two seats' or '3 tickets' from input text"""
+        match = re.search(
+            r"\b(\d+|" + "|".join(NUMBER_WORDS) + r")\s+(?:seats?|tickets?|people)\b",
+            text.lower()
+        )
+        if not match:
+            return None
+        count = match.group(1)
+        return int(count) if count.isdigit() else NUMBER_WORDS[count]
+
     def _handle_seat_select(self, user_input: str) -> str:
         if not self.booking_state.selected_showtime:
             return "Please select a showtime first."
 
         # Extract seat numbers from user input
+        available_seats = self.inventory.available_seats(self.booking_state.selected_showtime.id)
         requested_seats = []
-        for seat in self.booking_state.selected_showtime.available_seats:
+        for seat in available_seats:
             if seat.lower() in user_input.lower():
                 requested_seats.append(seat)
 
+        # Otherwise pick the best block for a group, e.g. 'two seats together'
+        seat_count = self.extract_seat_count(user_input)
+        if not requested_seats and seat_count:
+            requested_seats = self.inventory.best_adjacent(
+                self.booking_state.selected_showtime.id, seat_count
+            )
+            if not requested_seats:
+                return f"Sorry, there aren't {seat_count} seats together for this show. Available seats: {', '.join(available_seats)}"
+
         if requested_seats:
             self.booking_state.selected_seats = requested_seats
             self.booking_state.current_step = "SEATS_SELECTED"
@@ -135,7 +244,7 @@ class MovieBookingChatBot(ChatBot):
             return f"Selected seats: {', '.join(requested_seats)}. Total: ${total:.2f}. Would you like to confirm your booking?"
 
         # Show available seats
-        seats_list = ", ".join(self.booking_state.selected_showtime.available_seats)
+        seats_list = ", ".join(available_seats)
         return f"Available seats: {seats_list}"
 
     def _handle_booking_confirm(self, user_input: str) -> str:
@@ -146,8 +255,15 @@ class MovieBookingChatBot(ChatBot):
         ]):
             return "Please complete your selection first."
 
-        # Create booking
-        booking_id = f"BK{len(self.bookings) + 1}"
+        # Hold the seats before creating the booking; another session may have taken them
+        if not self.inventory.reserve(self.booking_state.selected_showtime.id,
+                                      self.booking_state.selected_seats):
+            self.booking_state.selected_seats = []
+            self.booking_state.current_step = "SHOWTIME_SELECTED"
+            return "Sorry, some of those seats have just been booked. Please choose different seats."
+
+        # Create booking; an archive is shared across processes, so it numbers bookings
+        booking_id = (self.archive or self.inventory).next_booking_id()
         total_amount = len(self.booking_state.selected_seats) * self.booking_state.selected_showtime.price
         
         booking = Booking(
@@ -163,10 +279,6 @@ class MovieBookingChatBot(ChatBot):
         
         self.bookings[booking_id] = booking
         
-        # Update available seats
-        for seat in self.booking_state.selected_seats:
-            self.booking_state.selected_showtime.available_seats.remove(seat)
-        
         # Reset booking state
         self.booking_state = MovieBookingState()
         
@@ -187,6 +299,13 @@ class MovieBookingChatBot(ChatBot):
                 booking_id = word.upper()
                 break
         
+        if booking_id and booking_id not in self.bookings and self.archive:
+            archived = self.archive.get_booking(booking_id)
+            if archived and archived.status == "CANCELLED":
+                return "This booking is already cancelled."
+            if archived:
+                return "This booking is for a past showing and can no longer be cancelled."
+
         if not booking_id or booking_id not in self.bookings:
             return "Please provide a valid booking ID."
         
@@ -195,15 +314,86 @@ class MovieBookingChatBot(ChatBot):
             return "This booking is already cancelled."
         
         # Return seats to available pool
-        showtime = self.showtimes[booking.showtime_id]
-        showtime.available_seats.extend(booking.seats)
-        showtime.available_seats.sort()
+        self.inventory.release(booking.showtime_id, booking.seats)
         
         # Update booking status
         booking.status = "CANCELLED"
         
         return f"Booking {booking_id} has been cancelled."
 
+    def _find_showtime(self, showtime_id: str) -> Optional[ShowTime]:
+        """Look up a showtime in memory, falling back to the archive"""
+        if showtime_id in self.showtimes:
+            return self.showtimes[showtime_id]
+        return self.archive.get_showtime(showtime_id) if self.archive else None
+
+    def compact(self, retention: timedelta = timedelta(days=1),
+                now: Optional[datetime] = None) -> int:
+        """Move past showtimes and settled bookings to the archive.
+
+        Showtimes that started more than ``retention`` ago are archived together
+        with all their bookings; cancelled bookings are archived straight away.
+        Returns the number of bookings moved out of memory (always 0 when
+        there is no archive).
+        """
+        cutoff = (now or datetime.now()) - retention
+        if self.catalog is not None:
+            # A memory-mapped catalog is already off-heap; only its seat state is dropped
+            self.inventory.forget_past(cutoff)
+        if self.archive is None:
+            return 0
+
+        with self._compaction_lock:
+            with self._state_lock:
+                past_showtimes = []
+                if self.catalog is None:
+                    past_showtimes = [st for st in self.showtimes.values() if st.datetime < cutoff]
+                past_ids = {st.id for st in past_showtimes}
+                # Copies, so the archive gets the state that was current at this point
+                settled = [
+                    copy.copy(booking) for booking in self.bookings.values()
+                    if booking.showtime_id in past_ids
+                    or booking.status == "CANCELLED"
+                    or self.showtimes[booking.showtime_id].datetime < cutoff
+                ]
+            if not past_showtimes and not settled:
+                return 0
+
+            # Disk I/O happens outside the state lock so turns are not held up
+            self.archive.archive(past_showtimes, settled)
+
+            with self._state_lock:
+                # Bookings cancelled in the meantime are rewritten below
+                changed = []
+                for booking in settled:
+                    if self.bookings[booking.id].status == booking.status:
+                        del self.bookings[booking.id]
+                    else:
+                        changed.append(copy.copy(self.bookings[booking.id]))
+                self._drop_showtimes(past_ids)
+
+            if changed:
+                self.archive.archive([], changed, replace=True)
+                with self._state_lock:
+                    for booking in changed:
+                        del self.bookings[booking.id]
+                    self._drop_showtimes(past_ids)
+            return len(settled)
+
+    def _drop_showtimes(self, showtime_ids: Set[str]) -> None:
+        """Remove archived showtimes that no in-memory booking refers to any more"""
+        in_use = {booking.showtime_id for booking in self.bookings.values()}
+        dropped = [
+            showtime_id for showtime_id in showtime_ids
+            if showtime_id in self.showtimes and showtime_id not in in_use
+        ]
+        for showtime_id in dropped:
+            del self.showtimes[showtime_id]
+        self.inventory.forget(dropped)
+        selected = self.booking_state.selected_showtime
+        if selected and selected.id in dropped:
+            self.booking_state = MovieBookingState()
+
     def _handle_booking_status(self, user_input: str) -> str:
         if not self.user_name:
             return "Please tell me your name first."
@@ -212,6 +402,12 @@ class MovieBookingChatBot(ChatBot):
             booking for booking in self.bookings.values()
             if booking.user_name == self.user_name
         ]
+        if self.archive:
+            # Older bookings are read back from the cold tier
+            user_bookings = [
+                booking for booking in self.archive.bookings_for_user(self.user_name)
+                if booking.id not in self.bookings
+            ] + user_bookings
         
         if not user_bookings:
             return "You don't have any bookings."
@@ -219,7 +415,7 @@ class MovieBookingChatBot(ChatBot):
         status_list = []
         for booking in user_bookings:
             movie = self.movies[booking.movie_id]
-            showtime = self.showtimes[booking.showtime_id]
+            showtime = self._find_showtime(booking.showtime_id)
             status_list.append(
                 f"Booking ID: {booking.id}\n"
                 f"Movie: {movie.title}\n"
@@ -231,10 +427,8 @@ class MovieBookingChatBot(ChatBot):
         
         return "Your bookings:\n" + "\n".join(status_list)
 
-    def _handle_intent(self, intent: Intent, user_input: str) -> str:
-        """Extended handler for movie booking intents"""
-        # First check booking-specific intents
-        booking_handlers = {
+    def _booking_handlers(self) -> Dict[Intent, Callable[[str], str]]:
+        return {
             Intent.MOVIE_SEARCH: self._handle_movie_search,
             Intent.MOVIE_SELECT: self._handle_movie_select,
             Intent.SHOW_TIME_SELECT: self._handle_show_time_select,
@@ -243,6 +437,18 @@ class MovieBookingChatBot(ChatBot):
             Intent.BOOKING_CANCEL: self._handle_booking_cancel,
             Intent.BOOKING_STATUS: self._handle_booking_status,
         }
+
+    def _resolve_handler(self, intent: Intent) -> Optional[Callable[[str], str]]:
+        """Booking handlers take precedence, as in _handle_intent"""
+        booking_handlers = self._booking_handlers()
+        if intent in booking_handlers:
+            return booking_handlers[intent]
+        return super()._resolve_handler(intent)
+
+    def _handle_intent(self, intent: Intent, user_input: str) -> str:
+        """Extended handler for movie booking intents"""
+        # First check booking-specific intents
+        booking_handlers = self._booking_handlers()
         
         if intent in booking_handlers:
             return booking_handlers[intent](user_input)
@@ -250,10 +456,10 @@ class MovieBookingChatBot(ChatBot):
         # Fall back to parent class handlers for basic intents
         return super()._handle_intent(intent, user_input)
 
-    def _get_capabilities_message(self) -> str:
+    def _build_capabilities_message(self) -> str:
         """Extended capabilities message including movie booking features"""
         return (
-            super()._get_capabilities_message() + "\n"
+            super()._build_capabilities_message() + "\n"
             "I can also help you:\n"
             "1. Search for available movies\n"
             "2. Book movie tickets\n"
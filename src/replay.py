@@ -0,0 +1,196 @@
+"""
+Headless replay of recorded dialogs for offline regression testing.
+
+Reads a JSONL file of dialogs lazily, runs each dialog in a fresh chatbot
+session on a process pool, and compares every turn against the recorded
+intent and response. Only a bounded window of dialogs is in flight at once,
+so memory use does not depend on the size of the input file.
+
+Each input line looks like:
+    {"id": "d1", "turns": [{"input": "Show me movies",
+                            "intent": "MOVIE_SEARCH",
+                            "response": "Here are the available movies:..."}]}
+where "intent" and "response" are optional expectations.
+
+Usage:
+    python -m src.replay dialogs.jsonl -o results.jsonl --workers 8
+    python -m src.replay dialogs.jsonl -o baseline.jsonl --record
+"""
+
+import argparse
+import difflib
+import json
+import os
+import random
+import sys
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from itertools import islice
+from typing import Deque, Dict, Iterable, Iterator, List, Optional
+from .movie_booking import MovieBookingChatBot
+
+# Chatbot class used by pool workers, set by the initializer
+_bot_class: type = MovieBookingChatBot
+
+
+def read_dialogs(path: str) -> Iterator[Dict]:
+    """Yield dialogs from a JSONL file one line at a time"""
+    with open(path, encoding='utf-8') as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                dialog = json.loads(line)
+            except json.JSONDecodeError as e:
+                dialog = {'error': f"line {line_number}: {e}"}
+            if not isinstance(dialog, dict):
+                kind = type(dialog).__name__
+                dialog = {'error': f"line {line_number}: expected a JSON object, got {kind}"}
+            dialog.setdefault('id', f"line-{line_number}")
+            yield dialog
+
+
+def _chunks(items: Iterable, size: int) -> Iterator[List]:
+    iterator = iter(items)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _init_worker(bot_class: type) -> None:
+    global _bot_class
+    _bot_class = bot_class
+
+
+def replay_dialog(dialog: Dict, bot_class: Optional[type] = None, record: bool = False) -> Dict:
+    """Run one dialog in a fresh session and compare it with its expectations"""
+    result = {'id': dialog['id'], 'passed': True, 'turns': 0, 'mismatches': []}
+    if 'error' in dialog:
+        result.update(passed=False, error=dialog['error'])
+        return result
+
+    start = time.perf_counter()
+    try:
+        bot = (bot_class or _bot_class)(user_data_file=None)
+        actual_turns = []
+        for number, turn in enumerate(dialog.get('turns', []), 1):
+            response = bot.process_input(turn['input'])
+            intent = bot.conversation_history[-1].intent.name
+            actual_turns.append({'input': turn['input'], 'intent': intent, 'response': response})
+
+            mismatch = {}
+            if 'intent' in turn and turn['intent'] != intent:
+                mismatch.update(expected_intent=turn['intent'], actual_intent=intent)
+            if 'response' in turn and turn['response'] != response:
+                mismatch['response_diff'] = list(difflib.unified_diff(
+                    turn['response'].splitlines(), response.splitlines(),
+                    'expected', 'actual', lineterm=''
+                ))
+            if mismatch:
+                result['mismatches'].append(dict(turn=number, input=turn['input'], **mismatch))
+        result['turns'] = len(actual_turns)
+        if record:
+            result['recorded'] = {'id': dialog['id'], 'turns': actual_turns}
+    except Exception as e:
+        result['error'] = f"{type(e).__name__}: {e}"
+
+    result['passed'] = not result['mismatches'] and 'error' not in result
+    result['elapsed_ms'] = (time.perf_counter() - start) * 1000
+    return result
+
+
+def _replay_chunk(dialogs: List[Dict], record: bool) -> List[Dict]:
+    return [replay_dialog(dialog, record=record) for dialog in dialogs]
+
+
+def replay(dialogs: Iterable[Dict], workers: Optional[int] = None, chunk_size: int = 64,
+           bot_class: type = MovieBookingChatBot, record: bool = False) -> Iterator[Dict]:
+    """Replay dialogs on a process pool, yielding results in input order"""
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(bot_class,)) as executor:
+        # Keep a few chunks per worker queued so workers never wait for input
+        window = 2 * workers
+        pending: Deque[Future] = deque()
+        for chunk in _chunks(dialogs, chunk_size):
+            pending.append(executor.submit(_replay_chunk, chunk, record))
+            if len(pending) >= window:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+class TimingSample:
+    """Fixed-size reservoir of dialog timings for percentiles over any number of dialogs"""
+
+    def __init__(self, size: int = 10000):
+        self.size = size
+        self.count = 0
+        self.values: List[float] = []
+        self._rng = random.Random(0)
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        if len(self.values) < self.size:
+            self.values.append(value)
+        else:
+            i = self._rng.randrange(self.count)
+            if i < self.size:
+                self.values[i] = value
+
+    def percentile(self, p: float) -> float:
+        if not self.values:
+            return 0.0
+        values = sorted(self.values)
+        return values[min(len(values) - 1, int(len(values) * p / 100))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay recorded dialogs and diff the results")
+    parser.add_argument('dialogs', help="JSONL file of recorded dialogs")
+    parser.add_argument('-o', '--output', help="write per-dialog results as JSONL (default: stdout)")
+    parser.add_argument('--workers', type=int, help="worker processes (default: CPU count)")
+    parser.add_argument('--chunk-size', type=int, default=64, help="dialogs per worker task")
+    parser.add_argument('--record', action='store_true',
+                        help="write actual intents and responses as a new baseline instead of results")
+    args = parser.parse_args()
+
+    out = open(args.output, 'w', encoding='utf-8') if args.output else sys.stdout
+    total = passed = turns = 0
+    timings = TimingSample()
+    start = time.perf_counter()
+    try:
+        for result in replay(read_dialogs(args.dialogs), args.workers, args.chunk_size,
+                             record=args.record):
+            total += 1
+            passed += result['passed']
+            turns += result['turns']
+            timings.add(result.get('elapsed_ms', 0.0))
+            if not args.record:
+                out.write(json.dumps(result) + "\n")
+            elif 'recorded' in result:
+                out.write(json.dumps(result['recorded']) + "\n")
+            else:
+                # A baseline line for a broken dialog would only fail the next replay
+                print(f"Not recorded: {result['id']}: {result.get('error')}", file=sys.stderr)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+    elapsed = time.perf_counter() - start
+    print(
+        f"Replayed {total} dialogs ({turns} turns) in {elapsed:.1f}s: "
+        f"{passed} passed, {total - passed} failed; "
+        f"dialog time p50={timings.percentile(50):.1f}ms p99={timings.percentile(99):.1f}ms",
+        file=sys.stderr
+    )
+    if passed != total and not args.record:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
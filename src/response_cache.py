@@ -0,0 +1,63 @@
+"""
+Process-wide cache for responses that do not depend on conversation state.
+
+Handlers opt in with the ``depends_on`` decorator, naming the chatbot values
+their response depends on besides the user's input. Repeated inputs are then
+answered from the cache without running intent classification or the
+handler. ``user_name`` is treated as a template field: responses are stored
+with a placeholder and the current name is substituted on the way out, so
+one entry serves every user.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+# Stands in for the user's name in cached templates
+NAME_PLACEHOLDER = "\0user_name\0"
+
+
+def depends_on(*names: str) -> Callable:
+    """Mark a handler as cacheable, depending only on the input and the named values"""
+    def decorator(handler: Callable) -> Callable:
+        handler.response_dependencies = names
+        return handler
+    return decorator
+
+
+def normalize_input(text: str) -> str:
+    """Cache key form of user input: lowercase with collapsed whitespace"""
+    return " ".join(text.lower().split())
+
+
+class ResponseCache:
+    """Thread-safe LRU cache shared by every chatbot in the process"""
+
+    def __init__(self, max_entries: int = 10000):
+        self.max_entries = max_entries
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+shared_response_cache = ResponseCache()
@@ -0,0 +1,242 @@
+"""
+Adjacent seat allocation using an index of free runs per row.
+
+Seats are labelled row letters followed by a number (A1, A2, ... B1, ...).
+For every row the allocator keeps the contiguous runs of free seats sorted by
+start position, updated incrementally as seats are held or released, plus a
+count of run lengths so the longest run is known without scanning seats.
+Showtimes are bucketed by their longest free run, which answers "which of
+these shows still has k seats together" without touching individual seats.
+"""
+
+import re
+from bisect import bisect_right, insort
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+_SEAT_RE = re.compile(r"^([A-Za-z]+)(\d+)$")
+
+
+def parse_seat(seat: str) -> Optional[Tuple[str, int]]:
+    """Split a seat label such as 'B12' into its row and number"""
+    match = _SEAT_RE.match(seat)
+    if not match:
+        return None
+    return match.group(1).upper(), int(match.group(2))
+
+
+class RowRuns:
+    """Contiguous free runs of one row, as sorted run starts and their lengths"""
+
+    def __init__(self, numbers: Iterable[int], free: Iterable[int]):
+        numbers = sorted(numbers)
+        self.first, self.last = numbers[0], numbers[-1]
+        self.centre = (self.first + self.last) / 2
+        self.starts: List[int] = []
+        self.lengths: Dict[int, int] = {}
+        self.length_counts: Counter = Counter()
+        for number in sorted(free):
+            if self.starts and self.starts[-1] + self.lengths[self.starts[-1]] == number:
+                self._set_length(self.starts[-1], self.lengths[self.starts[-1]] + 1)
+            else:
+                self.starts.append(number)
+                self._set_length(number, 1)
+
+    def _set_length(self, start: int, length: int) -> None:
+        old = self.lengths.get(start)
+        if old:
+            self.length_counts[old] -= 1
+            if not self.length_counts[old]:
+                del self.length_counts[old]
+        if length:
+            self.lengths[start] = length
+            self.length_counts[length] += 1
+        else:
+            self.lengths.pop(start, None)
+
+    @property
+    def max_run(self) -> int:
+        return max(self.length_counts, default=0)
+
+    def _run_index(self, number: int) -> int:
+        """Index of the last run starting at or before number (-1 if none)"""
+        return bisect_right(self.starts, number) - 1
+
+    def hold(self, number: int) -> None:
+        """Mark a free seat as taken, splitting its run"""
+        i = self._run_index(number)
+        if i < 0:
+            return
+        start = self.starts[i]
+        length = self.lengths[start]
+        if number >= start + length:
+            return
+
+        left = number - start
+        right = start + length - number - 1
+        if left:
+            self._set_length(start, left)
+        else:
+            self._set_length(start, 0)
+            del self.starts[i]
+        if right:
+            insort(self.starts, number + 1)
+            self._set_length(number + 1, right)
+
+    def release(self, number: int) -> None:
+        """Mark a seat as free, merging it with neighbouring runs"""
+        i = self._run_index(number)
+        if i >= 0 and number < self.starts[i] + self.lengths[self.starts[i]]:
+            return  # Already free
+
+        start, length = number, 1
+        if i >= 0 and self.starts[i] + self.lengths[self.starts[i]] == number:
+            start = self.starts[i]
+            length += self.lengths[start]
+        after = number + 1
+        if after in self.lengths:
+            length += self.lengths[after]
+            self._set_length(after, 0)
+            self.starts.remove(after)
+        if start == number:
+            insort(self.starts, number)
+        self._set_length(start, length)
+
+    def best(self, count: int) -> Optional[Tuple[float, int]]:
+        """Closest placement of count adjacent seats to the row centre, as (offset, start)"""
+        if self.max_run < count:
+            return None
+
+        best = None
+        # Walk outwards from the run nearest the centre and stop once runs
+        # are further away than the best placement found so far
+        middle = max(self._run_index(int(self.centre)), 0)
+        left, right = middle, middle + 1
+        while left >= 0 or right < len(self.starts):
+            for i in (left, right):
+                if not 0 <= i < len(self.starts):
+                    continue
+                start = self.starts[i]
+                length = self.lengths[start]
+                if length < count:
+                    continue
+                seat = round(self.centre - (count - 1) / 2)
+                seat = min(max(seat, start), start + length - count)
+                offset = abs(seat + (count - 1) / 2 - self.centre)
+                if best is None or offset < best[0]:
+                    best = (offset, seat)
+
+            nearest = []
+            if left - 1 >= 0:
+                prev = self.starts[left - 1]
+                nearest.append(self.centre - (prev + self.lengths[prev] - 1))
+            if right + 1 < len(self.starts):
+                nearest.append(self.starts[right + 1] - self.centre)
+            if best is not None and all(distance > best[0] for distance in nearest):
+                break
+            left -= 1
+            right += 1
+        return best
+
+
+class SeatAllocator:
+    """Free-run index over many showtimes for adjacent seat queries"""
+
+    def __init__(self):
+        self._rows: Dict[str, Dict[str, RowRuns]] = {}
+        self._labels: Dict[str, Dict[Tuple[str, int], str]] = {}
+        self._max_runs: Dict[str, int] = {}
+        self._by_max_run: Dict[int, Set[str]] = {}
+
+    def __contains__(self, showtime_id: str) -> bool:
+        return showtime_id in self._rows
+
+    def add_showtime(self, showtime_id: str, layout: Iterable[str], available: Iterable[str]) -> None:
+        """Index a showtime from its full seat layout and currently free seats"""
+        numbers: Dict[str, List[int]] = {}
+        labels: Dict[Tuple[str, int], str] = {}
+        for seat in layout:
+            parsed = parse_seat(seat)
+            if parsed:
+                numbers.setdefault(parsed[0], []).append(parsed[1])
+                labels[parsed] = seat
+
+        free: Dict[str, List[int]] = {row: [] for row in numbers}
+        for seat in available:
+            parsed = parse_seat(seat)
+            if parsed in labels:
+                free[parsed[0]].append(parsed[1])
+
+        self._rows[showtime_id] = {
+            row: RowRuns(row_numbers, free[row]) for row, row_numbers in numbers.items()
+        }
+        self._labels[showtime_id] = labels
+        self._update_max_run(showtime_id)
+
+    def remove_showtime(self, showtime_id: str) -> None:
+        """Stop indexing a showtime"""
+        if showtime_id in self._rows:
+            del self._rows[showtime_id]
+            del self._labels[showtime_id]
+            self._by_max_run[self._max_runs.pop(showtime_id)].discard(showtime_id)
+
+    def _update_max_run(self, showtime_id: str) -> None:
+        new = max((runs.max_run for runs in self._rows[showtime_id].values()), default=0)
+        old = self._max_runs.get(showtime_id)
+        if old == new:
+            return
+        if old is not None:
+            self._by_max_run[old].discard(showtime_id)
+        self._max_runs[showtime_id] = new
+        self._by_max_run.setdefault(new, set()).add(showtime_id)
+
+    def _update(self, showtime_id: str, seats: Iterable[str], hold: bool) -> None:
+        rows = self._rows[showtime_id]
+        for seat in seats:
+            parsed = parse_seat(seat)
+            if parsed in self._labels[showtime_id]:
+                if hold:
+                    rows[parsed[0]].hold(parsed[1])
+                else:
+                    rows[parsed[0]].release(parsed[1])
+        self._update_max_run(showtime_id)
+
+    def hold(self, showtime_id: str, seats: Iterable[str]) -> None:
+        self._update(showtime_id, seats, hold=True)
+
+    def release(self, showtime_id: str, seats: Iterable[str]) -> None:
+        self._update(showtime_id, seats, hold=False)
+
+    def max_run(self, showtime_id: str) -> int:
+        return self._max_runs[showtime_id]
+
+    def best_adjacent(self, showtime_id: str, count: int) -> Optional[List[str]]:
+        """Best count adjacent free seats: nearest the row centre, then the middle row"""
+        rows = self._rows[showtime_id]
+        if count < 1 or self._max_runs[showtime_id] < count:
+            return None
+
+        row_names = sorted(rows)
+        middle_row = (len(row_names) - 1) / 2
+        best = None
+        for position, row in enumerate(row_names):
+            placement = rows[row].best(count)
+            if placement is None:
+                continue
+            score = (placement[0], abs(position - middle_row))
+            if best is None or score < best[0]:
+                best = (score, row, placement[1])
+
+        _, row, start = best
+        labels = self._labels[showtime_id]
+        return [labels[(row, number)] for number in range(start, start + count)]
+
+    def showtimes_with_adjacent(self, count: int, showtime_ids: Optional[Iterable[str]] = None) -> Set[str]:
+        """Indexed showtimes (optionally limited to showtime_ids) with count seats together"""
+        matches = set()
+        for max_run, ids in self._by_max_run.items():
+            if max_run >= count:
+                matches |= ids
+        if showtime_ids is not None:
+            matches &= set(showtime_ids)
+        return matches
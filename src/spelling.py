@@ -0,0 +1,157 @@
+"""
+Fast spelling correction ahead of intent matching.
+
+Uses the symmetric-delete approach (as in SymSpell): every vocabulary word is
+indexed under all the strings obtained by deleting up to ``max_distance``
+characters from it. A misspelled token is corrected by generating its own
+deletes and looking them up, so no per-turn comparison against the whole
+vocabulary is needed. Indexes are cached on disk, keyed by a hash of the
+vocabulary, and only rebuilt when the intent patterns or catalog change.
+"""
+
+import hashlib
+import json
+import os
+import re
+import tempfile
+from typing import Callable, Dict, Iterable, List, Optional, Set
+
+INDEX_VERSION = 2
+_WORD_RE = re.compile(r"[a-z][a-z']*")
+
+# Indexes already loaded in this process, by vocabulary signature
+_loaded_indexes: Dict[str, 'SpellingIndex'] = {}
+
+
+def vocabulary_words(phrases: Iterable[str]) -> Set[str]:
+    """Split phrases such as intent patterns or titles into lowercase words"""
+    words = set()
+    for phrase in phrases:
+        words.update(_WORD_RE.findall(phrase.lower()))
+    return words
+
+
+def _deletes(word: str, max_distance: int) -> Set[str]:
+    """All strings reachable from word by deleting up to max_distance characters"""
+    results = {word}
+    frontier = {word}
+    for _ in range(max_distance):
+        frontier = {w[:i] + w[i + 1:] for w in frontier for i in range(len(w))}
+        results |= frontier
+    return results
+
+
+def _edit_distance(a: str, b: str, limit: int) -> int:
+    """Optimal string alignment distance, or limit + 1 if it exceeds limit"""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous2: List[int] = []
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                current[j] = min(current[j], previous2[j - 2] + 1)
+        if min(current) > limit:
+            return limit + 1
+        previous2, previous = previous, current
+    return previous[-1]
+
+
+class SpellingIndex:
+    """Symmetric-delete index mapping misspelled tokens to vocabulary words"""
+
+    def __init__(self, words: Iterable[str], max_distance: int = 2,
+                 deletes: Optional[Dict[str, List[str]]] = None,
+                 known_words: Iterable[str] = (),
+                 is_word: Optional[Callable[[str], bool]] = None):
+        # Correctly spelled words that are left alone but never used as
+        # corrections (e.g. stop words), so they are kept out of the index
+        self.known_words = set(known_words)
+        self.words = set(words) - self.known_words
+        # Optional dictionary check so real words outside the vocabulary are not rewritten
+        self.is_word = is_word
+        self.max_distance = max_distance
+        if deletes is None:
+            deletes = {}
+            for word in sorted(self.words):
+                for variant in _deletes(word, max_distance):
+                    deletes.setdefault(variant, []).append(word)
+        self.deletes = deletes
+
+    @staticmethod
+    def signature(words: Iterable[str], max_distance: int = 2,
+                  known_words: Iterable[str] = ()) -> str:
+        content = json.dumps([INDEX_VERSION, max_distance, sorted(words), sorted(known_words)])
+        return hashlib.sha1(content.encode('utf-8')).hexdigest()
+
+    @classmethod
+    def load(cls, words: Iterable[str], cache_file: Optional[str] = None,
+             max_distance: int = 2, known_words: Iterable[str] = (),
+             is_word: Optional[Callable[[str], bool]] = None) -> 'SpellingIndex':
+        """Return the index for a vocabulary, reusing memory or disk caches when valid"""
+        words, known_words = set(words), set(known_words)
+        signature = cls.signature(words, max_distance, known_words)
+        if signature in _loaded_indexes:
+            index = _loaded_indexes[signature]
+            if is_word is None or index.is_word is is_word:
+                return index
+            # Share the delete index but keep this caller's dictionary check
+            return cls(index.words, max_distance, index.deletes, known_words, is_word)
+
+        index = None
+        if cache_file and os.path.exists(cache_file):
+            try:
+                with open(cache_file, 'r') as f:
+                    data = json.load(f)
+                if data.get('signature') == signature:
+                    index = cls(words, max_distance, data['deletes'], known_words, is_word)
+            except (json.JSONDecodeError, IOError, KeyError) as e:
+                print(f"Error loading spelling index: {e}")
+
+        if index is None:
+            index = cls(words, max_distance, known_words=known_words, is_word=is_word)
+            if cache_file:
+                index.save(cache_file, signature)
+
+        _loaded_indexes[signature] = index
+        return index
+
+    def save(self, cache_file: str, signature: str) -> bool:
+        """Write the index atomically so concurrent processes never see a partial file"""
+        try:
+            directory = os.path.dirname(os.path.abspath(cache_file))
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+            with os.fdopen(fd, 'w') as f:
+                json.dump({'signature': signature, 'deletes': self.deletes}, f)
+            os.replace(tmp_path, cache_file)
+            return True
+        except IOError as e:
+            print(f"Error saving spelling index: {e}")
+            return False
+
+    def correct_word(self, word: str) -> str:
+        """Closest vocabulary word, or the word itself if it is known or too far off"""
+        if word in self.words or word in self.known_words or len(word) < 3 or not word.isalpha():
+            return word
+
+        # Short words get less leeway so unrelated short words are left alone
+        max_distance = 1 if len(word) <= 5 else self.max_distance
+        best, best_distance = word, max_distance + 1
+        candidates = set()
+        for variant in _deletes(word, max_distance):
+            candidates.update(self.deletes.get(variant, ()))
+        for candidate in sorted(candidates):
+            distance = _edit_distance(word, candidate, max_distance)
+            if distance < best_distance:
+                best, best_distance = candidate, distance
+        # Only consult the (slower) dictionary when a correction would be made
+        if best != word and self.is_word is not None and self.is_word(word):
+            return word
+        return best
+
+    def correct(self, text: str) -> str:
+        """Lowercase text and correct each word against the vocabulary"""
+        return _WORD_RE.sub(lambda m: self.correct_word(m.group(0)), text.lower())
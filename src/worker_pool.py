@@ -0,0 +1,282 @@
+"""
+Multi-process serving mode for the movie booking chatbot.
+
+The parent process builds the catalog file once, starts a shared seat
+inventory and then forks the workers. Each worker memory-maps the catalog
+read-only and keeps the chatbot sessions for the users pinned to it, so all
+cores can be used with a single copy of the catalog in RAM. Sessions that
+have been idle for ``session_ttl`` seconds and hold no bookings are dropped;
+compact() moves settled bookings to an optional shared archive so those
+sessions can be dropped too.
+"""
+
+import itertools
+import multiprocessing
+import os
+import queue
+import threading
+import time
+import zlib
+from concurrent.futures import Future
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Set, Tuple
+from .archive import BookingArchive
+from .catalog import MappedCatalog, write_catalog
+from .inventory import InventoryManager
+from .movie_booking import MovieBookingChatBot
+
+
+def _evict_idle(sessions: Dict[str, MovieBookingChatBot], last_used: Dict[str, float],
+                cutoff: float) -> None:
+    """Drop sessions idle since before cutoff, keeping any that still hold bookings"""
+    for user_id in [user_id for user_id, used in last_used.items() if used < cutoff]:
+        if not sessions[user_id].bookings:
+            del sessions[user_id]
+            del last_used[user_id]
+
+
+def _compact_sessions(sessions: Dict[str, MovieBookingChatBot], retention: timedelta,
+                      now: Optional[datetime]) -> int:
+    """Archive settled bookings of every session and return how many moved"""
+    return sum(
+        bot.compact(retention, now) for bot in sessions.values() if bot.bookings
+    )
+
+
+def _worker_main(bot_class: type, catalog_path: str, inventory,
+                 archive_path: Optional[str], requests: multiprocessing.Queue,
+                 results: multiprocessing.Queue, session_ttl: Optional[float]) -> None:
+    """Serve requests for the sessions pinned to this worker"""
+    catalog = MappedCatalog(catalog_path)
+    # SQLite connections must not cross a fork, so each worker opens its own
+    archive = BookingArchive(archive_path) if archive_path else None
+    sessions: Dict[str, MovieBookingChatBot] = {}
+    last_used: Dict[str, float] = {}
+    sweep_interval = session_ttl / 4 if session_ttl else None
+    next_sweep = time.monotonic() + (sweep_interval or 0)
+
+    while True:
+        try:
+            request = requests.get(timeout=sweep_interval)
+        except queue.Empty:
+            request = ()
+        if request is None:
+            break
+
+        now = time.monotonic()
+        if sweep_interval and now >= next_sweep:
+            _evict_idle(sessions, last_used, now - session_ttl)
+            next_sweep = now + sweep_interval
+        if not request:
+            continue
+
+        request_id, user_id, user_input = request
+        try:
+            if user_id is None:
+                # Compaction request from WorkerPool.compact: (retention, now)
+                archived = _compact_sessions(sessions, *user_input)
+                if session_ttl:
+                    _evict_idle(sessions, last_used, now - session_ttl)
+                results.put((request_id, archived, None))
+                continue
+            last_used[user_id] = now
+            bot = sessions.get(user_id)
+            if bot is None:
+                bot = bot_class(catalog=catalog, inventory=inventory, archive=archive,
+                                user_data_file=None)
+                sessions[user_id] = bot
+            results.put((request_id, bot.process_input(user_input), None))
+        except Exception as e:
+            results.put((request_id, None, f"{type(e).__name__}: {e}"))
+
+    sessions.clear()
+    if archive is not None:
+        archive.close()
+    catalog.close()
+
+
+class WorkerPool:
+    """Pre-fork pool of chatbot workers sharing one memory-mapped catalog"""
+
+    def __init__(self, num_workers: Optional[int] = None,
+                 catalog_path: str = "catalog.bin",
+                 bot_class: type = MovieBookingChatBot,
+                 build_catalog: bool = True,
+                 session_ttl: Optional[float] = 3600.0,
+                 archive_path: Optional[str] = None):
+        self.num_workers = num_workers or os.cpu_count() or 1
+        self.catalog_path = catalog_path
+        # False serves an existing catalog, e.g. one written by catalog_import
+        self.build_catalog = build_catalog
+        self.bot_class = bot_class
+        # Idle seconds before a session without bookings is dropped (None keeps them all)
+        self.session_ttl = session_ttl
+        # Optional archive file shared by all workers; booking IDs are then issued from it
+        self.archive_path = archive_path
+        self.inventory = None
+
+        self._manager: Optional[InventoryManager] = None
+        self._workers: List[multiprocessing.Process] = []
+        self._request_queues: List[multiprocessing.Queue] = []
+        self._results: Optional[multiprocessing.Queue] = None
+        # Request ID -> (future, index of the worker handling it)
+        self._pending: Dict[int, Tuple[Future, int]] = {}
+        self._dead_workers: Set[int] = set()
+        self._pending_lock = threading.Lock()
+        self._request_ids = itertools.count()
+        self._dispatcher: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Build the catalog, start the inventory service and fork the workers"""
+        if self.build_catalog:
+            template = self.bot_class(user_data_file=None)
+            write_catalog(
+                self.catalog_path, template.movies, template.showtimes,
+                template.compile_intent_patterns()
+            )
+
+        methods = multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context('fork' if 'fork' in methods else None)
+
+        self._manager = InventoryManager(ctx=context)
+        self._manager.start()
+        self.inventory = self._manager.SeatInventory(self.catalog_path)
+
+        self._results = context.Queue()
+        for _ in range(self.num_workers):
+            requests = context.Queue()
+            worker = context.Process(
+                target=_worker_main,
+                args=(self.bot_class, self.catalog_path, self.inventory,
+                      self.archive_path, requests, self._results, self.session_ttl),
+                daemon=True
+            )
+            worker.start()
+            self._request_queues.append(requests)
+            self._workers.append(worker)
+
+        self._dispatcher = threading.Thread(target=self._dispatch_results, daemon=True)
+        self._dispatcher.start()
+
+    def _dispatch_results(self) -> None:
+        next_check = time.monotonic() + 1.0
+        while True:
+            try:
+                result = self._results.get(timeout=1.0)
+            except queue.Empty:
+                result = ()
+            if result is None:
+                break
+            if result:
+                self._deliver(result)
+            # Check even under load, so callers of a dead worker never wait forever
+            if not result or time.monotonic() >= next_check:
+                self._fail_dead_workers()
+                next_check = time.monotonic() + 1.0
+
+    def _deliver(self, result: tuple) -> None:
+        request_id, response, error = result
+        with self._pending_lock:
+            future, _ = self._pending.pop(request_id, (None, None))
+        if future is None:
+            return
+        if error is None:
+            future.set_result(response)
+        else:
+            future.set_exception(RuntimeError(error))
+
+    def _fail_dead_workers(self) -> None:
+        """Fail the pending requests of workers that have exited"""
+        dead = {
+            index for index, worker in enumerate(self._workers)
+            if index not in self._dead_workers and not worker.is_alive()
+        }
+        if not dead:
+            return
+        # Results a worker sent before exiting are already queued; deliver them first
+        while True:
+            try:
+                result = self._results.get_nowait()
+            except queue.Empty:
+                break
+            if result is None:
+                self._results.put(None)
+                break
+            self._deliver(result)
+
+        with self._pending_lock:
+            self._dead_workers |= dead
+            failed = [
+                (request_id, future, index)
+                for request_id, (future, index) in self._pending.items() if index in dead
+            ]
+            for request_id, _, _ in failed:
+                del self._pending[request_id]
+        for _, future, index in failed:
+            future.set_exception(RuntimeError(
+                f"worker {index} exited with code {self._workers[index].exitcode}"
+            ))
+
+    def worker_for(self, user_id: str) -> int:
+        """Index of the worker that owns a user's session"""
+        return zlib.crc32(user_id.encode('utf-8')) % self.num_workers
+
+    def submit(self, user_id: str, user_input: str) -> Future:
+        """Queue a turn for a user's session and return a future for the response"""
+        return self._submit(self.worker_for(user_id), user_id, user_input)
+
+    def _submit(self, worker: int, user_id: Optional[str], payload) -> Future:
+        future: Future = Future()
+        request_id = next(self._request_ids)
+        with self._pending_lock:
+            if worker in self._dead_workers:
+                future.set_exception(RuntimeError(f"worker {worker} has exited"))
+                return future
+            self._pending[request_id] = future, worker
+        self._request_queues[worker].put((request_id, user_id, payload))
+        return future
+
+    def process_input(self, user_id: str, user_input: str, timeout: Optional[float] = None) -> str:
+        """Process one turn for a user and wait for the response"""
+        return self.submit(user_id, user_input).result(timeout)
+
+    def compact(self, retention: timedelta = timedelta(days=1),
+                now: Optional[datetime] = None) -> int:
+        """Prune past showtimes from the shared inventory and compact every worker.
+
+        Workers archive the settled bookings of their sessions (when the pool
+        has an archive) and then drop idle sessions. Returns the number of
+        bookings archived, so a CompactionTask can drive the pool like a bot.
+        """
+        self.inventory.forget_past((now or datetime.now()) - retention)
+        futures = [
+            self._submit(worker, None, (retention, now))
+            for worker in range(self.num_workers)
+        ]
+        return sum(future.result() for future in futures)
+
+    def close(self) -> None:
+        """Stop the workers, the result dispatcher and the inventory service"""
+        for requests in self._request_queues:
+            requests.put(None)
+        for worker in self._workers:
+            worker.join()
+        if self._dispatcher is not None:
+            self._results.put(None)
+            self._dispatcher.join()
+        if self._manager is not None:
+            self._manager.shutdown()
+
+        self._workers.clear()
+        self._request_queues.clear()
+        self._dead_workers.clear()
+        self._dispatcher = None
+        self._manager = None
+        self.inventory = None
+
+    def __enter__(self) -> 'WorkerPool':
+        self.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
@@ -0,0 +1,122 @@
+import sqlite3
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+
+import nltk
+import pytest
+
+from src.archive import BookingArchive
+from src.inventory import SeatInventory
+from src.models import Booking, ShowTime
+
+
+def _nltk_data_available():
+    try:
+        for resource in ('corpora/stopwords', 'corpora/wordnet', 'tokenizers/punkt'):
+            nltk.data.find(resource)
+    except LookupError:
+        return False
+    return True
+
+
+needs_nltk_data = pytest.mark.skipif(not _nltk_data_available(), reason="NLTK data not downloaded")
+
+
+def _booking(booking_id, user_name="Alice", status="CONFIRMED"):
+    return Booking(booking_id, user_name, "mov1", "st1", ["A1"], 12.99, status, datetime.now())
+
+
+def _issue_ids(path, count):
+    archive = BookingArchive(path)
+    try:
+        return [archive.next_booking_id() for _ in range(count)]
+    finally:
+        archive.close()
+
+
+def test_archives_sharing_a_file_issue_distinct_ids(tmp_path):
+    path = str(tmp_path / "archive.db")
+    first, second = BookingArchive(path), BookingArchive(path)
+    ids = [archive.next_booking_id() for _ in range(3) for archive in (first, second)]
+    assert ids == [f"BK{n}" for n in range(1, 7)]
+
+    third = BookingArchive(path)
+    assert third.next_booking_id() == "BK7"
+
+
+def test_ids_are_distinct_across_processes(tmp_path):
+    path = str(tmp_path / "archive.db")
+    BookingArchive(path).close()
+    with ProcessPoolExecutor(max_workers=4) as executor:
+        batches = list(executor.map(_issue_ids, [path] * 4, [25] * 4))
+    ids = [booking_id for batch in batches for booking_id in batch]
+    assert len(set(ids)) == 100
+
+
+def test_numbering_continues_after_existing_bookings(tmp_path):
+    path = str(tmp_path / "archive.db")
+    archive = BookingArchive(path)
+    archive.archive([], [_booking("BK41")])
+    # Simulate an archive written before booking numbers were issued by it
+    archive._db.execute("DELETE FROM sqlite_sequence WHERE name = 'booking_numbers'")
+    archive._db.commit()
+    archive.close()
+
+    assert BookingArchive(path).next_booking_id() == "BK42"
+
+
+def test_archived_bookings_are_never_replaced(tmp_path):
+    archive = BookingArchive(str(tmp_path / "archive.db"))
+    archive.archive([], [_booking("BK1", "Alice")])
+    with pytest.raises(sqlite3.IntegrityError):
+        archive.archive([], [_booking("BK1", "Bob")])
+    assert archive.get_booking("BK1").user_name == "Alice"
+
+
+def test_inventory_forgets_past_showtimes():
+    now = datetime.now()
+    showtimes = {
+        "past": ShowTime("past", "mov1", now - timedelta(days=2), ["A1", "A2"], 12.99),
+        "future": ShowTime("future", "mov1", now + timedelta(days=2), ["A1", "A2"], 12.99),
+    }
+    inventory = SeatInventory(showtimes)
+    assert inventory.reserve("past", ["A1"])
+    assert inventory.reserve("future", ["A1"])
+
+    assert inventory.forget_past(now - timedelta(days=1)) == ["past"]
+    # The showtime is still listed, but its seats must not be loaded again
+    assert inventory.available_seats("past") == []
+    assert not inventory.reserve("past", ["A2"])
+    assert inventory.best_adjacent("past", 1) is None
+    assert inventory.available_seats("future") == ["A2"]
+    assert inventory.forget_past(now - timedelta(days=1)) == []
+
+
+@needs_nltk_data
+def test_two_bots_sharing_an_archive(tmp_path):
+    from src.movie_booking import MovieBookingChatBot, MovieBookingState
+
+    path = str(tmp_path / "archive.db")
+    bots = [
+        MovieBookingChatBot(user_data_file=None, spelling_cache_file=None, archive_file=path)
+        for _ in range(2)
+    ]
+    for _ in range(2):
+        for bot, (name, seat) in zip(bots, [("Alice", "A1"), ("Bob", "A2")]):
+            bot.user_name = name
+            showtime = bot.showtimes["st1"]
+            bot.booking_state = MovieBookingState()
+            bot.booking_state.selected_movie = bot.movies[showtime.movie_id]
+            bot.booking_state.selected_showtime = showtime
+            bot.booking_state.selected_seats = [seat]
+            confirmation = bot._handle_booking_confirm("pay")
+            booking_id = confirmation.splitlines()[1].split(": ")[1]
+            bot._handle_booking_cancel(f"cancel {booking_id}")
+            # Cancelled bookings are archived straight away
+            assert bot.compact() == 1
+
+    archive = bots[0].archive
+    alice = [booking.id for booking in archive.bookings_for_user("Alice")]
+    bob = [booking.id for booking in archive.bookings_for_user("Bob")]
+    assert len(alice) == len(bob) == 2
+    assert len(set(alice + bob)) == 4
@@ -0,0 +1,105 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.catalog import MappedCatalog, write_catalog, write_records
+from src.models import Movie, ShowTime
+
+LAYOUT = ["A1", "A2", "A3", "B1", "B2"]
+
+
+def _movies(count):
+    return [Movie(f"m{i}", f"Film {i} – Amélie ✨", 90 + i, "English", "Drama") for i in range(count)]
+
+
+def _showtimes(movies, start=datetime(2026, 10, 20, 18, 0)):
+    return [
+        (f"s{i}", movie.id, start + timedelta(hours=i), 9.5 + i, LAYOUT, {"A2"} if i % 2 else None)
+        for i, movie in enumerate(movies)
+    ]
+
+
+@pytest.mark.parametrize("movie_count", [1, 2, 3, 4, 5])
+def test_round_trip_with_odd_and_even_string_counts(tmp_path, movie_count):
+    path = str(tmp_path / "catalog.bin")
+    movies = _movies(movie_count)
+    showtimes = _showtimes(movies)
+    write_records(path, movies, showtimes)
+
+    with MappedCatalog(path) as catalog:
+        assert sorted(catalog.movies) == sorted(movie.id for movie in movies)
+        for movie in movies:
+            assert catalog.movies[movie.id] == movie
+        for showtime_id, movie_id, when, price, layout, booked in showtimes:
+            showtime = catalog.showtimes[showtime_id]
+            assert showtime == ShowTime(
+                showtime_id, movie_id, when,
+                [seat for seat in layout if seat not in (booked or ())], price
+            )
+            assert catalog.seat_layout(showtime_id) == LAYOUT
+
+
+def test_empty_catalog(tmp_path):
+    path = str(tmp_path / "catalog.bin")
+    write_records(path, [], [])
+
+    with MappedCatalog(path) as catalog:
+        assert len(catalog.movies) == 0
+        assert len(catalog.showtimes) == 0
+        assert catalog.showtimes_for_movie("m0") == []
+        with pytest.raises(KeyError):
+            catalog.movies["m0"]
+
+
+def test_movies_without_showtimes(tmp_path):
+    path = str(tmp_path / "catalog.bin")
+    movies = _movies(2)
+    write_records(path, movies, [], {"hello": ["hello"]})
+
+    with MappedCatalog(path) as catalog:
+        assert [catalog.movies[movie.id] for movie in movies] == movies
+        assert len(catalog.showtimes) == 0
+        assert dict(catalog.pattern_tokens) == {"hello": ["hello"]}
+
+
+def test_showtimes_for_movie_in_time_order(tmp_path):
+    path = str(tmp_path / "catalog.bin")
+    movies = _movies(3)
+    start = datetime(2026, 10, 20, 12, 0)
+    # IDs deliberately out of time order
+    showtimes = [
+        ("s3", "m1", start + timedelta(hours=5), 10.0, LAYOUT, None),
+        ("s1", "m1", start + timedelta(hours=9), 10.0, LAYOUT, None),
+        ("s2", "m0", start + timedelta(hours=1), 10.0, LAYOUT, None),
+        ("s4", "m1", start + timedelta(hours=1), 10.0, LAYOUT, None),
+    ]
+    write_records(path, movies, showtimes)
+
+    with MappedCatalog(path) as catalog:
+        assert [st.id for st in catalog.showtimes_for_movie("m1")] == ["s4", "s3", "s1"]
+        assert [st.id for st in catalog.showtimes_for_movie("m0")] == ["s2"]
+        assert catalog.showtimes_for_movie("m2") == []
+
+
+def test_write_catalog_from_memory(tmp_path):
+    path = str(tmp_path / "catalog.bin")
+    movies = {movie.id: movie for movie in _movies(2)}
+    showtimes = {
+        "s1": ShowTime("s1", "m0", datetime(2026, 10, 20, 18, 0), ["A1", "B1"], 12.5),
+    }
+    write_catalog(path, movies, showtimes)
+
+    with MappedCatalog(path) as catalog:
+        assert catalog.showtimes["s1"] == showtimes["s1"]
+
+
+def test_rewrite_leaves_open_readers_intact(tmp_path):
+    path = str(tmp_path / "catalog.bin")
+    write_records(path, _movies(1), [])
+
+    with MappedCatalog(path) as old:
+        write_records(path, _movies(50), [])
+        assert old.movies["m0"] == _movies(1)[0]
+        with MappedCatalog(path) as new:
+            assert len(new.movies) == 50
+    assert [p.name for p in tmp_path.iterdir()] == ["catalog.bin"]
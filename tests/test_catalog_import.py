@@ -0,0 +1,97 @@
+import json
+from datetime import datetime
+
+import pytest
+
+from src.catalog import MappedCatalog
+from src.catalog_import import main, read_csv, read_json
+
+MOVIES_CSV = "id,title,duration,language,genre\nm1,Alpha,100,English,Drama\n"
+
+
+def _write(path, text):
+    path.write_text(text, encoding="utf-8")
+    return str(path)
+
+
+def _import(monkeypatch, *args):
+    monkeypatch.setattr("sys.argv", ["catalog_import", *args])
+    main()
+
+
+def test_csv_import(tmp_path, monkeypatch):
+    movies = _write(tmp_path / "movies.csv", MOVIES_CSV)
+    showtimes = _write(
+        tmp_path / "showtimes.csv",
+        "id,movie_id,datetime,price,seats,booked\ns1,m1,2026-10-20T19:00:00,10,A1 A2 A3,A2\n",
+    )
+    output = str(tmp_path / "catalog.bin")
+    _import(monkeypatch, movies, showtimes, "-o", output)
+
+    with MappedCatalog(output) as catalog:
+        showtime = catalog.showtimes["s1"]
+        assert showtime.datetime == datetime(2026, 10, 20, 19, 0)
+        assert showtime.available_seats == ["A1", "A3"]
+        assert catalog.movies[showtime.movie_id].title == "Alpha"
+
+
+def test_unknown_movie_is_rejected_with_line(tmp_path, monkeypatch):
+    movies = _write(tmp_path / "movies.csv", MOVIES_CSV)
+    showtimes = _write(
+        tmp_path / "showtimes.csv",
+        "id,movie_id,datetime,price,seats\n"
+        "s1,m1,2026-10-20T19:00:00,10,A1\n"
+        "s2,m9,2026-10-20T20:00:00,10,A1\n",
+    )
+    output = tmp_path / "catalog.bin"
+    with pytest.raises(SystemExit, match=r"showtimes\.csv, line 3: showtime s2 refers to unknown movie m9"):
+        _import(monkeypatch, movies, showtimes, "-o", str(output))
+    assert not output.exists()
+
+
+def test_invalid_row_is_rejected_with_line(tmp_path):
+    movies = _write(tmp_path / "movies.csv", MOVIES_CSV)
+    showtimes = _write(
+        tmp_path / "showtimes.csv",
+        "id,movie_id,datetime,price,seats\ns1,m1,2026-10-20T19:00:00,ten,A1\n",
+    )
+    _, records = read_csv(movies, showtimes)
+    with pytest.raises(ValueError, match=r"line 2: invalid record"):
+        list(records)
+
+
+def test_json_unknown_movie_is_rejected(tmp_path):
+    schedule = _write(tmp_path / "schedule.json", json.dumps({
+        "movies": [{"id": "m1", "title": "Alpha", "duration": 100, "language": "en", "genre": "x"}],
+        "showtimes": [{"id": "s1", "movie_id": "m2", "datetime": "2026-10-20T19:00:00",
+                       "price": 10, "seats": ["A1"]}],
+    }))
+    movies, showtimes = read_json(schedule)
+    list(movies)
+    with pytest.raises(ValueError, match=r"showtimes\[0\]: showtime s1 refers to unknown movie m2"):
+        list(showtimes)
+
+
+def test_json_invalid_movie_is_rejected(tmp_path):
+    schedule = _write(tmp_path / "schedule.json", json.dumps({
+        "movies": [{"id": "m1", "title": "Alpha", "duration": "long", "language": "en", "genre": "x"}],
+    }))
+    with pytest.raises(ValueError, match=r"movies\[0\]: invalid record"):
+        read_json(schedule)
+
+
+def test_offset_and_local_times_share_one_zone(tmp_path):
+    aware = "2026-10-20T19:00:00+01:00"
+    local = datetime.fromisoformat(aware).astimezone().replace(tzinfo=None)
+    movies = _write(tmp_path / "movies.csv", MOVIES_CSV)
+    showtimes = _write(
+        tmp_path / "showtimes.csv",
+        "id,movie_id,datetime,price,seats\n"
+        f"s1,m1,{aware},10,A1\n"
+        f"s2,m1,{local.isoformat()},10,A1\n",
+    )
+    movie_records, records = read_csv(movies, showtimes)
+    list(movie_records)
+    first, second = list(records)
+    assert first[2] == second[2] == local
+    assert first[2].tzinfo is None
@@ -0,0 +1,14 @@
+from src.replay import read_dialogs
+
+
+def test_read_dialogs_reports_bad_lines(tmp_path):
+    path = tmp_path / "dialogs.jsonl"
+    path.write_text('{"id": "ok", "turns": []}\n\n[1, 2]\n"text"\nnot json\n', encoding="utf-8")
+
+    dialogs = list(read_dialogs(str(path)))
+
+    assert [dialog["id"] for dialog in dialogs] == ["ok", "line-3", "line-4", "line-5"]
+    assert "error" not in dialogs[0]
+    assert dialogs[1]["error"] == "line 3: expected a JSON object, got list"
+    assert dialogs[2]["error"] == "line 4: expected a JSON object, got str"
+    assert dialogs[3]["error"].startswith("line 5: ")